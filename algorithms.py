@@ -1,108 +1,514 @@
 # algorithms.py
-import pulp
 import time
+import heapq
 import numpy as np
 import config
 import utils
+import precompute
+import assignment
+from localsearch import LocalSearch
+from instrument import NULL_STATS
+from backends import get_backend, load_pulp
 
-def solve_optimal(users, uav_locs, inputs):
+# Multiply UAV Cost by 1000 so the solver prioritizes saving drones over distance.
+PRIORITY_WEIGHT = 1000
+
+# A solve stopped by a gap or time limit is only reported Optimal if its
+# proven relative gap is this small
+OPTIMALITY_TOLERANCE = 1e-6
+
+def solve_optimal(users, uav_locs, inputs, candidates=None, aggregated=False, stats=None,
+                  backend=None, threads=None):
     """
     Algorithm 1: Branch and Bound (Optimal).
     
     CHANGE: Time Limit Removed. 
     This will run until the absolute best solution is found.
+    `candidates` is an optional precompute.CandidateIndex shared across solves.
+    `aggregated` drops the per-pair C2 rows (see DeploymentModel).
+    `stats` is an optional instrument.SolverStats that receives phase timings.
+    `backend` and `threads` pick the MILP solver (see backends.get_backend).
+    For a beta sweep on one scenario, build a DeploymentModel once instead.
+    """
+    model = DeploymentModel(users, uav_locs, inputs, candidates, aggregated=aggregated, stats=stats)
+    return model.solve(inputs['beta'], stats=stats, backend=backend, threads=threads)
+
+def solve_anytime(users, uav_locs, inputs, time_limit=config.ANYTIME_TIME_LIMIT,
+                  gap=config.ANYTIME_GAP, candidates=None, stats=None, backend=None, threads=None):
+    """
+    Algorithm 1 with bounded latency.
+    The MILP solver is seeded with the solve_heuristic solution (if the
+    backend takes a MIP start) and stops after `time_limit` seconds or once
+    the relative `gap` is proven.
+    Returns solve_optimal's tuple plus a quality dict (objective, bound, gap).
     """
     start_time = time.time()
-    
-    num_users = len(users)
-    num_uavs = len(uav_locs)
-    
-    # Inputs
-    beta = inputs['beta']
-    uav_cost = inputs['uav_cost']
-    budget = inputs['budget']
-    max_dist = inputs['max_dist']
-    
-    prob = pulp.LpProblem("UAV_Deployment", pulp.LpMinimize)
-    
-    # Variables
-    x = pulp.LpVariable.dicts("x", range(num_uavs), cat='Binary')
-    y = pulp.LpVariable.dicts("y", (range(num_uavs), range(num_users)), cat='Binary')
-    
-    # Pre-calculate distances
-    dists = np.zeros((num_uavs, num_users))
-    for m in range(num_uavs):
-        for n in range(num_users):
-            dists[m][n] = utils.calculate_distance(users[n], uav_locs[m])
+    stats = stats or NULL_STATS
+    if candidates is None:
+        with stats.phase('distances'):
+            candidates = precompute.build_candidate_index(users, uav_locs, inputs['max_dist'])
 
-    # --- OBJECTIVE FUNCTION ---
-    # Multiply UAV Cost by 1000 so the solver prioritizes saving drones over distance.
-    PRIORITY_WEIGHT = 1000 
-    prob += (pulp.lpSum(x[m] for m in range(num_uavs)) * uav_cost * PRIORITY_WEIGHT) + \
-            (pulp.lpSum(dists[m][n] * y[m][n] for m in range(num_uavs) for n in range(num_users)))
+    with stats.phase('heuristic_seed'):
+        heu = solve_heuristic(users, uav_locs, inputs, candidates)
+    model = DeploymentModel(users, uav_locs, inputs, candidates, stats=stats)
+    active_indices, connections_dict, utility, _ = model.solve_anytime(
+        inputs['beta'], heu, time_limit=time_limit, gap=gap, stats=stats,
+        backend=backend, threads=threads)
 
-    # --- CONSTRAINTS ---
-    
-    # C1: Beta Coverage
-    prob += pulp.lpSum(y[m][n] for m in range(num_uavs) for n in range(num_users)) >= beta * num_users
-    
-    # C7: Budget
-    prob += (pulp.lpSum(x[m] for m in range(num_uavs)) * uav_cost) <= budget
+    return active_indices, connections_dict, utility, time.time() - start_time, model.quality
 
-    for m in range(num_uavs):
-        for n in range(num_users):
-            # C2: Validity
-            prob += y[m][n] <= x[m]
-        
-        # C3 & C4: Dynamic Load Balancing
-        prob += pulp.lpSum(y[m][n] for n in range(num_users)) <= inputs['gamma_max'] * x[m]
-        prob += pulp.lpSum(y[m][n] for n in range(num_users)) >= inputs['gamma_min'] * x[m]
+class DeploymentModel:
+    """
+    The ILP of Algorithm 1, built once per scenario.
+    Only the C1 coverage right-hand side depends on beta, so a sweep swaps
+    that single row and re-solves, warm-starting CBC from the last incumbent.
 
-    for n in range(num_users):
-        # C5: Single Connection
-        prob += pulp.lpSum(y[m][n] for m in range(num_uavs)) <= 1
-        
-        # C6: Max Distance
-        for m in range(num_uavs):
-            if dists[m][n] > max_dist:
-                prob += y[m][n] == 0
-
-    # --- SOLVER CONFIGURATION (UNLIMITED) ---
-    try:
-        # REMOVED: timeLimit=5, options=['ratio 0.05']
-        # Now it runs until optimality is proven.
-        prob.solve(pulp.PULP_CBC_CMD(msg=0))
-    except:
-        return [], {}, 0, 0
-
-    # Check Validity
-    if pulp.LpStatus[prob.status] != 'Optimal' and pulp.LpStatus[prob.status] != 'Feasible':
-        return [], {}, 0, time.time() - start_time
+    sparse=True only creates y[m][n] for pairs within max_dist (C6 holds by
+    construction) and drops sites that can never reach gamma_min users.
+    sparse=False keeps the original dense formulation for comparison.
+    aggregated=True relies on C3 (sum_n y[m][n] <= gamma_max * x[m]) alone
+    instead of adding the per-pair C2 rows y[m][n] <= x[m]; the model is
+    smaller but its LP relaxation is weaker.
+    """
+
+    COVERAGE = "C1_Coverage"
+
+    def __init__(self, users, uav_locs, inputs, candidates=None, sparse=True, aggregated=False, stats=None):
+        start_time = time.time()
+        stats = stats or NULL_STATS
+
+        self.inputs = dict(inputs)
+        self.num_users = len(users)
+        self.num_uavs = len(uav_locs)
+        self.has_incumbent = False
+
+        # Pre-calculate distances
+        if candidates is None:
+            with stats.phase('distances'):
+                candidates = precompute.build_candidate_index(users, uav_locs, inputs['max_dist'])
+        with stats.phase('model_build'):
+            self._build(candidates, sparse, aggregated)
+        if stats.enabled:
+            for name, value in self.size().items():
+                stats.count(name, value)
+
+        # Charged to the first solve so per-beta runtimes still add up
+        self._pending_time = time.time() - start_time
+
+    def _build(self, candidates, sparse, aggregated):
+        num_users = self.num_users
+        num_uavs = self.num_uavs
+        inputs = self.inputs
+
+        # Inputs
+        uav_cost = inputs['uav_cost']
+        budget = inputs['budget']
+        g_min = inputs['gamma_min']
+        g_max = inputs['gamma_max']
+
+        pulp = load_pulp()
+        prob = pulp.LpProblem("UAV_Deployment", pulp.LpMinimize)
+
+        # Columns: links[m] = [(n, y[m][n], dist), ...]
+        links = {}
+        if sparse:
+            # A site with fewer than gamma_min reachable users can never open (C4)
+            counts = candidates.counts()
+            sites = [m for m in range(num_uavs) if counts[m] >= max(g_min, 1)]
+            for m in sites:
+                idx, dist = candidates.users_of(m)
+                links[m] = [(n, pulp.LpVariable(f"y_{m}_{n}", cat='Binary'), d)
+                            for n, d in zip(idx.tolist(), dist.tolist())]
+        else:
+            # Unreachable pairs are zeroed and blocked by C6
+            dists = candidates.dense()
+            sites = list(range(num_uavs))
+            for m in sites:
+                links[m] = [(n, pulp.LpVariable(f"y_{m}_{n}", cat='Binary'), dists[m][n])
+                            for n in range(num_users)]
+
+        # Variables
+        x = pulp.LpVariable.dicts("x", sites, cat='Binary')
+
+        # --- OBJECTIVE FUNCTION ---
+        prob += (pulp.lpSum(x[m] for m in sites) * uav_cost * PRIORITY_WEIGHT) + \
+                (pulp.lpSum(d * var for m in sites for _, var, d in links[m]))
+
+        # --- CONSTRAINTS ---
+
+        # C1: Beta Coverage (right-hand side is set per solve)
+        self.covered = pulp.lpSum(var for m in sites for _, var, _ in links[m])
+        prob += pulp.LpConstraint(self.covered, pulp.LpConstraintGE, self.COVERAGE, 0)
+
+        # C7: Budget
+        prob += (pulp.lpSum(x[m] for m in sites) * uav_cost) <= budget
+
+        user_links = [[] for _ in range(num_users)]
+        for m in sites:
+            if not aggregated:
+                for _, var, _ in links[m]:
+                    # C2: Validity
+                    prob += var <= x[m]
+
+            # C3 & C4: Dynamic Load Balancing
+            load = pulp.lpSum(var for _, var, _ in links[m])
+            prob += load <= g_max * x[m]
+            prob += load >= g_min * x[m]
+
+            for n, var, _ in links[m]:
+                user_links[n].append(var)
 
-    # Extract Results
-    active_indices = [m for m in range(num_uavs) if pulp.value(x[m]) is not None and pulp.value(x[m]) > 0.5]
-    connections_dict = {}
-    total_dist = 0
-    
-    for m in active_indices:
-        user_list = []
         for n in range(num_users):
-            if pulp.value(y[m][n]) is not None and pulp.value(y[m][n]) > 0.5:
-                user_list.append(n)
-                total_dist += dists[m][n]
-        connections_dict[m] = user_list
+            # C5: Single Connection
+            if user_links[n]:
+                prob += pulp.lpSum(user_links[n]) <= 1
+
+        if not sparse:
+            # C6: Max Distance
+            reachable = candidates.mask()
+            for m in sites:
+                for n, var, _ in links[m]:
+                    if not reachable[m][n]:
+                        prob += var == 0
+
+        self.prob = prob
+        self.sites = sites
+        self.x = x
+        self.links = links
+
+    def size(self):
+        """Model dimensions as passed to the solver: rows, columns, nonzeros."""
+        return {
+            'rows': len(self.prob.constraints),
+            'columns': len(self.prob.variables()),
+            'nonzeros': sum(len(c) for c in self.prob.constraints.values()),
+        }
+
+    def set_beta(self, beta):
+        """Replaces the C1 row in place; every other row is left untouched."""
+        pulp = load_pulp()
+        self.prob.constraints[self.COVERAGE] = pulp.LpConstraint(
+            self.covered, pulp.LpConstraintGE, self.COVERAGE, beta * self.num_users)
+
+    def set_incumbent(self, connections_dict):
+        """Loads a known solution (e.g. from solve_heuristic) as the next MIP start."""
+        for m in self.sites:
+            chosen = set(connections_dict.get(m, ()))
+            self.x[m].setInitialValue(1 if chosen else 0)
+            for n, var, _ in self.links[m]:
+                var.setInitialValue(1 if n in chosen else 0)
+        self.has_incumbent = True
+
+    def solve(self, beta, time_limit=None, gap=None, incumbent=None, stats=None, backend=None, threads=None):
+        """
+        Solves for one beta. Same return contract as solve_optimal.
+        time_limit (seconds) and gap (relative) enable anytime mode: the solver
+        stops early and returns its best incumbent. `incumbent` is an optional
+        connections_dict used as the MIP start.
+        `backend` names an entry of backends.BACKENDS (default
+        config.SOLVER_BACKEND) run with `threads` threads.
+        Objective, proven bound and gap of the solve are left in self.quality;
+        its status is 'Optimal' only when optimality is proven, not merely
+        when the solver stopped at `gap`.
+        """
+        stats = stats or NULL_STATS
+        pulp = load_pulp()
+        backend = get_backend(backend, threads)
+        start_time = time.time() - self._pending_time
+        self._pending_time = 0
+        self.quality = {'status': 'Not Solved', 'objective': None, 'bound': None, 'gap': None}
+
+        self.set_beta(beta)
+        if incumbent is not None:
+            self.set_incumbent(incumbent)
+        prob = self.prob
+        x = self.x
+
+        # --- SOLVER CONFIGURATION (UNLIMITED unless anytime mode) ---
+        try:
+            # REMOVED: timeLimit=5, options=['ratio 0.05']
+            # Now it runs until optimality is proven.
+            solve_start = time.perf_counter()
+            solver_log = backend.solve(prob, time_limit=time_limit, gap=gap,
+                                       warm_start=self.has_incumbent and backend.warm_start)
+            solve_time = time.perf_counter() - solve_start
+        except:
+            self.has_incumbent = False
+            return [], {}, 0, 0
+
+        # The solver's own wall clock vs. PuLP handing over the model and reading back
+        name = backend.name
+        solver_time = min(solver_log.get('wallclock', solve_time), solve_time)
+        stats.add_time(name + '_io', solve_time - solver_time)
+        stats.add_time(name + '_solve', solver_time)
+        for key in ('nodes', 'iterations'):
+            if key in solver_log:
+                stats.count(name + '_' + key, solver_log[key])
+
+        # Check Validity
+        if pulp.LpStatus[prob.status] != 'Optimal' and pulp.LpStatus[prob.status] != 'Feasible':
+            self.has_incumbent = False
+            return [], {}, 0, time.time() - start_time
+        self.has_incumbent = True
+
+        # Proven optimal: the bound is the objective itself (CBC only leaves the
+        # bound out of its log once the search is closed). A solver stopped at
+        # `gap` also says optimal, so with a limit only the proven gap counts.
+        objective = pulp.value(prob.objective) or 0
+        limited = time_limit is not None or gap is not None
+        bound = solver_log.get('bound')
+        if bound is None and prob.sol_status == pulp.LpSolutionOptimal:
+            bound = objective
+        proven_gap = _relative_gap(objective, bound)
+        optimal = prob.sol_status == pulp.LpSolutionOptimal and (
+            not limited or proven_gap <= OPTIMALITY_TOLERANCE)
+        self.quality = {
+            'status': 'Optimal' if optimal else 'Feasible',
+            'objective': objective,
+            'bound': bound,
+            'gap': proven_gap,
+        }
+
+        # Extract Results
+        with stats.phase('extract'):
+            active_indices = [m for m in self.sites if pulp.value(x[m]) is not None and pulp.value(x[m]) > 0.5]
+            connections_dict = {}
+            total_dist = 0
+
+            for m in active_indices:
+                user_list = []
+                for n, var, d in self.links[m]:
+                    if pulp.value(var) is not None and pulp.value(var) > 0.5:
+                        user_list.append(n)
+                        total_dist += d
+                connections_dict[m] = user_list
+
+        conn_count = sum(len(u) for u in connections_dict.values())
+        utility = utils.calculate_weighted_utility(len(active_indices), conn_count, total_dist, self.inputs, self.num_uavs)
+
+        return active_indices, connections_dict, utility, time.time() - start_time
+
+    def solve_anytime(self, beta, heuristic, time_limit=config.ANYTIME_TIME_LIMIT,
+                      gap=config.ANYTIME_GAP, stats=None, backend=None, threads=None):
+        """
+        solve() in anytime mode, seeded with `heuristic` (solve_heuristic's
+        result for this beta). If the solver finds nothing in time the
+        heuristic answer is returned instead and self.quality's status is
+        'Heuristic'.
+        """
+        result = self.solve(beta, time_limit=time_limit, gap=gap, incumbent=heuristic[1],
+                            stats=stats, backend=backend, threads=threads)
+        if not result[0] and heuristic[0]:
+            # The solver found nothing in time; the heuristic is still the best known answer
+            self.quality = dict(self.quality, status='Heuristic')
+            return heuristic[0], heuristic[1], heuristic[2], result[3]
+        return result
+
+def _relative_gap(objective, bound):
+    if bound is None:
+        return None
+    return max(0.0, objective - bound) / max(abs(objective), 1e-9)
+
+def solve_branch_and_bound(users, uav_locs, inputs, candidates=None, time_limit=None, stats=None):
+    """
+    In-process exact solver for the Algorithm 1 model, branching on the
+    site-open variables x[m]. Minimizes the same objective as the ILP
+    (PRIORITY_WEIGHT * uav_cost per open site + total distance).
+
+    A node fixes some sites open and some closed. Its bound combines
+    - the fewest further sites whose capacities min(gamma_max, reachable)
+      could still cover the beta target, and
+    - the min-cost assignment with every non-closed site available
+      (gamma_min only enforced on the fixed-open ones).
+    Children are queued with a cheap bound (their parent's assignment cost,
+    or the nearest-site distances of the target users if larger) and only
+    get their own assignment once they are popped. That assignment is
+    repaired from the parent's (assignment.assign_users), as a branch
+    changes one site. Opening a site that already holds gamma_min users in
+    the parent's assignment keeps it optimal, so that child needs no solve.
+    Once one more site would cost more than the incumbent, a node whose
+    fixed-open sites can already reach the target is settled by those sites.
+    The greedy + exact assignment (solve_hybrid) answer is the first
+    incumbent; each node also tries the sites its relaxation used.
+    Nodes are explored best bound first. With `time_limit` (seconds) the best
+    incumbent so far is returned once it is exceeded.
+    Same return contract as solve_optimal; the objective is left in stats.
+    """
+    start_time = time.time()
+    stats = stats or NULL_STATS
+    if candidates is None:
+        with stats.phase('distances'):
+            candidates = precompute.build_candidate_index(users, uav_locs, inputs['max_dist'])
+
+    uav_cost = inputs['uav_cost']
+    g_min = inputs['gamma_min']
+    g_max = inputs['gamma_max']
+    max_sites = int(inputs['budget'] // uav_cost) if uav_cost > 0 else len(uav_locs)
+    target_users = int(np.ceil(inputs['beta'] * len(users)))
+    open_cost = PRIORITY_WEIGHT * uav_cost
+
+    # Same site filter as the sparse ILP (C4 can never hold elsewhere)
+    counts = candidates.counts()
+    sites = [m for m in range(len(uav_locs)) if counts[m] >= max(g_min, 1)]
+    caps = {m: min(g_max, int(counts[m])) for m in sites}
+    dists = candidates.dense(fill=np.inf)
+
+    evaluated = {}
+
+    def evaluate(open_sites, start=None):
+        """(objective, assign, sites) for exactly these sites, or None if infeasible."""
+        key = frozenset(open_sites)
+        if key not in evaluated:
+            result = None
+            if len(key) <= max_sites:
+                result = assignment.assign_users(sorted(key), candidates, target_users, g_min, g_max, start)
+            if result is None or (result[0] >= 0).sum() < target_users:
+                evaluated[key] = None
+            else:
+                evaluated[key] = (open_cost * len(key) + result[1], result[0], key)
+        return evaluated[key]
+
+    def site_count(fixed_open, closed):
+        """Fewest sites a node can end up with, ignoring shared users; None if over budget."""
+        if len(fixed_open) > max_sites:
+            return None
+        short = target_users - sum(caps[m] for m in fixed_open)
+        free_caps = sorted((caps[m] for m in sites if m not in fixed_open and m not in closed), reverse=True)
+        k = len(fixed_open)
+        for cap in free_caps:
+            if short <= 0:
+                break
+            short -= cap
+            k += 1
+        if short > 0 or k > max_sites:
+            return None
+        return k
+
+    def nearest_bound(avail):
+        """Total distance if the target users each went to their nearest site in `avail`."""
+        if target_users == 0:
+            return 0.0
+        nearest = dists[avail].min(axis=0) if avail else np.zeros(0)
+        nearest = nearest[np.isfinite(nearest)]
+        if len(nearest) < target_users:
+            return None
+        return float(np.partition(nearest, target_users - 1)[:target_users].sum())
+
+    def relaxation(fixed_open, closed, start):
+        """(assignment distance, assign) of a node's relaxation, or None if it cannot be feasible."""
+        avail = [m for m in sites if m not in closed]
+        mins = [g_min if m in fixed_open else 0 for m in avail]
+        result = assignment.assign_users(avail, candidates, target_users, mins, g_max, start)
+        if result is None or (result[0] >= 0).sum() < target_users:
+            return None
+        return result[1], result[0]
+
+    with stats.phase('incumbent'):
+        best = None
+        seed = solve_hybrid(users, uav_locs, inputs, candidates)
+        if seed[0]:
+            start = np.full(len(users), -1, dtype=np.int64)
+            for m, user_list in seed[1].items():
+                start[user_list] = m
+            best = evaluate(seed[0], start)
+        if target_users == 0:
+            best = (0.0, np.full(len(users), -1, dtype=np.int64), frozenset())
 
+    nodes = 0
+    flows = 0
+    with stats.phase('search'):
+        # Entries: (bound, tie, fixed_open, closed, k, dist, assign, exact). Until
+        # `exact`, the bound is the cheap one and `assign` is the parent's
+        heap = []
+        tie = 0
+        k = site_count(frozenset(), frozenset())
+        if k is not None:
+            # The root relaxation starts from the incumbent's assignment
+            heap.append((open_cost * k, tie, frozenset(), frozenset(), k, 0.0,
+                         best[1] if best is not None else None, False))
+        while heap:
+            if time_limit is not None and time.time() - start_time > time_limit:
+                break
+            lb, _, fixed_open, closed, k, dist, relax, exact = heapq.heappop(heap)
+            # Distances are floats; stop once no node can improve by more than rounding
+            if best is not None and lb >= best[0] - 1e-6:
+                break
+
+            if len(fixed_open) == k and best is not None and open_cost * (k + 1) >= best[0] - 1e-6:
+                # One more site already costs more than the incumbent, so only
+                # these sites themselves can improve on it
+                nodes += 1
+                near = nearest_bound(sorted(fixed_open))
+                if near is None or open_cost * k + max(dist, near) >= best[0] - 1e-6:
+                    continue
+                candidate = evaluate(fixed_open, relax)
+                if candidate is not None and candidate[0] < best[0] - 1e-9:
+                    best = candidate
+                continue
+            if not exact:
+                flows += 1
+                result = relaxation(fixed_open, closed, relax)
+                if result is not None:
+                    tie += 1
+                    dist, relax = result
+                    heapq.heappush(heap, (open_cost * k + dist, tie, fixed_open, closed, k, dist, relax, True))
+                continue
+            nodes += 1
+
+            load = np.bincount(relax[relax >= 0], minlength=len(uav_locs))
+            used = np.flatnonzero(load).tolist()
+            # The exact assignment on `used` costs at least the relaxation's distance
+            if best is None or open_cost * len(used) + dist < best[0] - 1e-9:
+                candidate = evaluate(used, relax)
+                if candidate is not None and (best is None or candidate[0] < best[0] - 1e-9):
+                    best = candidate
+
+            free_used = [m for m in used if m not in fixed_open]
+            if not free_used:
+                # The relaxation only uses fixed-open sites, so it is this node's optimum
+                continue
+            # Branch on the free site carrying the most users in the relaxation
+            m = max(free_used, key=lambda s: (load[s], -s))
+            for child_open, child_closed in ((fixed_open | {m}, closed), (fixed_open, closed | {m})):
+                child_k = site_count(child_open, child_closed)
+                if child_k is None:
+                    continue
+                if child_open is not fixed_open and load[m] >= g_min:
+                    # The parent's assignment already meets the new gamma_min row
+                    child = (open_cost * child_k + dist, child_k, dist, relax, True)
+                else:
+                    near = nearest_bound([s for s in sites if s not in child_closed])
+                    if near is None:
+                        continue
+                    child = (open_cost * child_k + max(dist, near), child_k, dist, relax, False)
+                if best is None or child[0] < best[0] - 1e-6:
+                    tie += 1
+                    heapq.heappush(heap, (child[0], tie, child_open, child_closed) + child[1:])
+    stats.count('bnb_nodes', nodes)
+    stats.count('bnb_flows', flows)
+
+    if best is None:
+        return [], {}, 0, time.time() - start_time
+
+    objective, assign, open_sites = best
+    connections_dict = {m: np.flatnonzero(assign == m).tolist() for m in sorted(open_sites)}
+    stats.count('objective', objective)
+    active_indices = sorted(connections_dict)
+    total_dist = objective - open_cost * len(active_indices)
     conn_count = sum(len(u) for u in connections_dict.values())
-    utility = utils.calculate_weighted_utility(len(active_indices), conn_count, total_dist, inputs, num_uavs)
-    
+    utility = utils.calculate_weighted_utility(len(active_indices), conn_count, total_dist, inputs, len(uav_locs))
+
     return active_indices, connections_dict, utility, time.time() - start_time
 
-def solve_heuristic(users, uav_locs, inputs):
+def solve_heuristic(users, uav_locs, inputs, candidates=None, stats=None):
     """
     Algorithm 3: Greedy Heuristic with Set Cover Logic.
     Stops deploying as soon as Beta target is reached.
+    `candidates` is an optional precompute.CandidateIndex shared across solves.
+    `stats` is an optional instrument.SolverStats that receives phase timings.
     """
     start_time = time.time()
+    stats = stats or NULL_STATS
     
     num_users = len(users)
     num_uavs = len(uav_locs)
@@ -119,62 +525,227 @@ def solve_heuristic(users, uav_locs, inputs):
     target_users = int(np.ceil(beta * num_users))
     
     # Step 1: Map potentials
-    potential_uav_users = {m: [] for m in range(num_uavs)}
-    for m in range(num_uavs):
-        for n in range(num_users):
-            dist = utils.calculate_distance(users[n], uav_locs[m])
-            if dist <= max_dist:
-                potential_uav_users[m].append((n, dist))
+    with stats.phase('candidates'):
+        if candidates is None:
+            candidates = precompute.build_candidate_index(users, uav_locs, max_dist)
+        potential_uav_users = {}
+        for m in range(num_uavs):
+            idx, dist = candidates.users_of(m)
+            potential_uav_users[m] = list(zip(idx.tolist(), dist.tolist()))
     
     # Step 2: Sort by Popularity
-    valid_uavs = []
-    for m, user_list in potential_uav_users.items():
-        if len(user_list) >= g_min:
-            valid_uavs.append(m)
+    with stats.phase('sort'):
+        valid_uavs = []
+        for m, user_list in potential_uav_users.items():
+            if len(user_list) >= g_min:
+                valid_uavs.append(m)
             
-    valid_uavs.sort(key=lambda m: len(potential_uav_users[m]), reverse=True)
+        valid_uavs.sort(key=lambda m: len(potential_uav_users[m]), reverse=True)
     
     # Step 3: Deployment
-    active_indices = []
-    connections_dict = {}
-    covered_users_set = set()
-    current_cost = 0
-    final_dist = 0
-    
-    for m in valid_uavs:
-        # STOP if Target Met
-        if len(covered_users_set) >= target_users:
-            break
-        if current_cost + uav_cost > budget:
-            break
+    with stats.phase('deploy'):
+        active_indices = []
+        connections_dict = {}
+        covered_users_set = set()
+        current_cost = 0
+        final_dist = 0
+    
+        for m in valid_uavs:
+            # STOP if Target Met
+            if len(covered_users_set) >= target_users:
+                break
+            if current_cost + uav_cost > budget:
+                break
             
-        possible_users = potential_uav_users[m]
-        possible_users.sort(key=lambda x: x[1])
+            possible_users = potential_uav_users[m]
+            possible_users.sort(key=lambda x: x[1])
         
-        new_connections = []
-        for n, dist in possible_users:
-            if n not in covered_users_set:
-                new_connections.append((n, dist))
+            new_connections = []
+            for n, dist in possible_users:
+                if n not in covered_users_set:
+                    new_connections.append((n, dist))
         
-        # Max Load Pruning
-        if len(new_connections) > g_max:
-            new_connections = new_connections[:g_max]
+            # Max Load Pruning
+            if len(new_connections) > g_max:
+                new_connections = new_connections[:g_max]
         
-        # Deploy if meaningful
-        if len(new_connections) > 0:
-            if len(new_connections) >= g_min:
-                current_cost += uav_cost
-                active_indices.append(m)
+            # Deploy if meaningful
+            if len(new_connections) > 0:
+                if len(new_connections) >= g_min:
+                    current_cost += uav_cost
+                    active_indices.append(m)
                 
-                user_ids = [u[0] for u in new_connections]
-                connections_dict[m] = user_ids
+                    user_ids = [u[0] for u in new_connections]
+                    connections_dict[m] = user_ids
                 
-                for n, dist in new_connections:
-                    covered_users_set.add(n)
-                    final_dist += dist
+                    for n, dist in new_connections:
+                        covered_users_set.add(n)
+                        final_dist += dist
 
     duration = time.time() - start_time
     conn_count = len(covered_users_set)
     utility = utils.calculate_weighted_utility(len(active_indices), conn_count, final_dist, inputs, num_uavs)
     
-    return active_indices, connections_dict, utility, duration
\ No newline at end of file
+    return active_indices, connections_dict, utility, duration
+
+def solve_local_search(users, uav_locs, inputs, candidates=None, budget_ms=config.LOCAL_SEARCH_BUDGET_MS, stats=None):
+    """
+    Algorithm 3 followed by a local-search improvement stage.
+    The greedy deployment is improved by LocalSearch (swap/close/open site
+    and user reassignment moves) until no move helps or `budget_ms`
+    milliseconds have passed; the result is never worse than the greedy one.
+    """
+    start_time = time.time()
+    stats = stats or NULL_STATS
+    if candidates is None:
+        with stats.phase('distances'):
+            candidates = precompute.build_candidate_index(users, uav_locs, inputs['max_dist'])
+
+    with stats.phase('greedy'):
+        active_indices, connections_dict = solve_heuristic(users, uav_locs, inputs, candidates)[:2]
+    target_users = int(np.ceil(inputs['beta'] * len(users)))
+    with stats.phase('local_search'):
+        search = LocalSearch(inputs, len(uav_locs), candidates, active_indices, connections_dict, target_users)
+        search.run(budget_ms)
+    stats.count('ls_moves', search.moves)
+
+    active_indices, connections_dict, conn_count, total_dist = search.solution()
+    utility = utils.calculate_weighted_utility(len(active_indices), conn_count, total_dist, inputs, len(uav_locs))
+    
+    return active_indices, connections_dict, utility, time.time() - start_time
+
+def solve_heuristic_lazy(users, uav_locs, inputs, candidates=None, stats=None):
+    """
+    Algorithm 3, lazy-greedy variant.
+    Sites are ranked by marginal gain (uncovered reachable users, capped at
+    gamma_max) instead of their static popularity. A max-heap holds possibly
+    stale gains; only the top is re-checked, and gains are kept exact through
+    the user-to-sites reverse index as users get covered.
+    Same return contract and stopping rules as solve_heuristic.
+    """
+    start_time = time.time()
+    stats = stats or NULL_STATS
+    
+    num_users = len(users)
+    num_uavs = len(uav_locs)
+    
+    # Inputs
+    beta = inputs['beta']
+    max_dist = inputs['max_dist']
+    budget = inputs['budget']
+    uav_cost = inputs['uav_cost']
+    g_min = inputs['gamma_min']
+    g_max = inputs['gamma_max']
+    
+    # C1 Target
+    target_users = int(np.ceil(beta * num_users))
+    
+    # Step 1: Forward and reverse candidate maps
+    with stats.phase('candidates'):
+        if candidates is None:
+            candidates = precompute.build_candidate_index(users, uav_locs, max_dist)
+        sites_of_user = candidates.transpose()
+        uncovered = candidates.counts().copy()
+        covered = np.zeros(num_users, dtype=bool)
+
+    # Step 2: Heap keyed on marginal gain (ties broken by site index)
+    with stats.phase('heap'):
+        heap = [(-min(int(uncovered[m]), g_max), m) for m in range(num_uavs) if uncovered[m] >= max(g_min, 1)]
+        heapq.heapify(heap)
+    
+    # Step 3: Deployment
+    with stats.phase('deploy'):
+        active_indices = []
+        connections_dict = {}
+        covered_count = 0
+        current_cost = 0
+        final_dist = 0
+    
+        while heap:
+            # STOP if Target Met
+            if covered_count >= target_users:
+                break
+            if current_cost + uav_cost > budget:
+                break
+
+            neg_gain, m = heapq.heappop(heap)
+            gain = min(int(uncovered[m]), g_max)
+            if gain != -neg_gain:
+                # Stale key: re-queue with the current gain
+                if gain >= max(g_min, 1):
+                    heapq.heappush(heap, (-gain, m))
+                continue
+            # A fresh top below gamma_min means no site can still be deployed
+            if gain < max(g_min, 1):
+                break
+
+            # Nearest uncovered users first, up to Max Load
+            idx, dist = candidates.users_of(m)
+            free = ~covered[idx]
+            idx, dist = idx[free], dist[free]
+            nearest = np.argsort(dist, kind='stable')[:g_max]
+            new_users = idx[nearest]
+
+            current_cost += uav_cost
+            active_indices.append(m)
+            connections_dict[m] = new_users.tolist()
+            final_dist += float(dist[nearest].sum())
+
+            # Marginal gains drop for every site that could reach the new users
+            covered[new_users] = True
+            covered_count += len(new_users)
+            touched = [sites_of_user.users_of(n)[0] for n in new_users.tolist()]
+            if touched:
+                np.subtract.at(uncovered, np.concatenate(touched), 1)
+
+    duration = time.time() - start_time
+    utility = utils.calculate_weighted_utility(len(active_indices), covered_count, final_dist, inputs, num_uavs)
+    
+    return active_indices, connections_dict, utility, duration
+
+def solve_hybrid(users, uav_locs, inputs, candidates=None, selector=None, stats=None):
+    """
+    Heuristic site selection followed by an exact assignment stage.
+    `selector` picks the sites (solve_heuristic by default); users are then
+    assigned by assignment.assign_users at minimum total distance for the
+    beta target, as the ILP would for the same sites. The selector's own
+    assignment is the start, so only its improving moves are left to make.
+    """
+    start_time = time.time()
+    stats = stats or NULL_STATS
+    if candidates is None:
+        with stats.phase('distances'):
+            candidates = precompute.build_candidate_index(users, uav_locs, inputs['max_dist'])
+    if selector is None:
+        selector = solve_heuristic
+
+    with stats.phase('select'):
+        active_indices, selected = selector(users, uav_locs, inputs, candidates)[:2]
+    target_users = int(np.ceil(inputs['beta'] * len(users)))
+    with stats.phase('assign'):
+        start = np.full(len(users), -1, dtype=np.int64)
+        for m, user_list in selected.items():
+            start[user_list] = m
+        result = assignment.assign_users(active_indices, candidates, target_users,
+                                         inputs['gamma_min'], inputs['gamma_max'], start)
+    if result is None:
+        return [], {}, 0, time.time() - start_time
+
+    assign, total_dist = result
+    connections_dict = {m: np.flatnonzero(assign == m).tolist() for m in active_indices}
+    conn_count = sum(len(u) for u in connections_dict.values())
+    utility = utils.calculate_weighted_utility(len(active_indices), conn_count, total_dist, inputs, len(uav_locs))
+    
+    return active_indices, connections_dict, utility, time.time() - start_time
+
+# Solvers by name; each is called as solver(users, uav_locs, inputs, candidates, stats=None)
+SOLVERS = {
+    'optimal': solve_optimal,
+    'anytime': lambda users, uav_locs, inputs, candidates=None, stats=None, **options: solve_anytime(
+        users, uav_locs, inputs, candidates=candidates, stats=stats, **options),
+    'bnb': solve_branch_and_bound,
+    'heuristic': solve_heuristic,
+    'lazy': solve_heuristic_lazy,
+    'local': solve_local_search,
+    'hybrid': solve_hybrid,
+}
\ No newline at end of file
@@ -0,0 +1,279 @@
+# assignment.py
+import numpy as np
+
+INF = float('inf')
+
+def assign_users(sites, candidates, target, g_min, g_max, start=None):
+    """
+    Exact user-to-UAV assignment for a fixed set of open sites.
+    Solved as a min-cost flow: source -> site (gamma_min..gamma_max) ->
+    reachable user (cost = distance) -> sink, with the sink -> source return
+    arc rewarding coverage up to the target. The result meets every gamma_min
+    first, then the target, at minimum total distance; coverage only goes past
+    the target where the gamma_min total needs it.
+    `g_min` may also be a per-site sequence, e.g. 0 for sites that may stay empty.
+    `start` is an earlier answer as a user -> site array (-1 = uncovered), e.g.
+    the greedy one or a related problem's: users of sites not in `sites` are
+    freed and the rest kept, so a close start needs only a few repair steps.
+    It must not give a site more than gamma_max users.
+    Returns (assign, total_dist) with `assign` a user -> site array
+    (-1 = uncovered), or None if some site cannot reach gamma_min users.
+    Coverage falls short of `target` only if the sites cannot serve that many
+    users at all.
+    """
+    sites = np.asarray(sites, dtype=np.int64)
+    num_users = candidates.num_users
+    result = np.full(num_users, -1, dtype=np.int64)
+    if len(sites) == 0:
+        return result, 0.0
+    mins = np.asarray(g_min if np.ndim(g_min) else [g_min] * len(sites), dtype=np.int64)
+
+    graph = _SiteGraph(candidates, sites, mins, g_max, target)
+    if start is not None:
+        local = np.full(candidates.num_uavs, -1, dtype=np.int64)
+        local[sites] = np.arange(len(sites))
+        start = start[graph.users]
+        covered = start >= 0
+        graph.place(np.where(covered, local[np.where(covered, start, 0)], -1))
+
+    # Cancel improving cycles until none is left; the return arc makes the
+    # flow value part of the cost, so this also fills (or trims) coverage
+    while True:
+        cycles = graph.negative_cycles()
+        if not cycles:
+            break
+        for cycle in cycles:
+            graph.apply(cycle)
+
+    if np.any(graph.load < mins):
+        return None
+    linked = np.flatnonzero(graph.assign < len(sites))
+    result[graph.users[linked]] = sites[graph.assign[linked]]
+    return result, float(graph.own[linked].sum())
+
+class _SiteGraph:
+    """
+    Residual graph of an assignment contracted onto its sites, plus source
+    (num_sites) and sink (num_sites + 1). Reaching a site means it has a free
+    slot to fill; each arc fills it with the cheapest user:
+    a -> b         a takes over one of b's users     min d(a, u) - d(b, u)
+    a -> sink      a takes an uncovered user          min d(a, u)
+    sink -> b      b lets one of its users go         min -d(b, u)
+    source -> a    a serves one more user             -3 big below gamma_min, else 0
+    a -> source    a serves one user less             +3 big at or below gamma_min, else 0
+    sink -> source one more user covered              -big below the target, else 0
+    source -> sink one user less covered              +big at or below the target, else 0
+    `big` outweighs the distances of any cycle, so gamma_min comes before
+    coverage and coverage before distance. With only a few sites,
+    Bellman-Ford on the dense (num_sites + 2)^2 matrix is cheap and handles
+    the negative arcs directly. Users are only touched through the reachable
+    (site, user) pairs, so unreachable users cost nothing.
+    """
+
+    EPS = 1e-9
+
+    def __init__(self, candidates, sites, mins, g_max, target):
+        self.num_sites = len(sites)
+        self.mins = mins
+        self.g_max = g_max
+        self.target = target
+        rows = [candidates.users_of(m) for m in sites]
+        self.indptr = np.zeros(self.num_sites + 1, dtype=np.int64)
+        np.cumsum([len(idx) for idx, _ in rows], out=self.indptr[1:])
+        # Reachable (site, user, distance) pairs, grouped by site; users are
+        # numbered 0..U-1 over self.users, the ones some site can reach
+        pair_user = np.concatenate([idx for idx, _ in rows])
+        reach = np.zeros(candidates.num_users, dtype=bool)
+        reach[pair_user] = True
+        self.users = np.flatnonzero(reach)
+        self.pair_user = (np.cumsum(reach) - 1)[pair_user]
+        self.pair_site = np.repeat(np.arange(self.num_sites), np.diff(self.indptr))
+        self.pair_row = self.pair_site * (self.num_sites + 2)
+        self.pair_dist = np.concatenate([dist for _, dist in rows]).astype(float)
+        max_d = float(self.pair_dist.max()) if len(self.pair_dist) else 0.0
+        self.big = (self.num_sites + 2) * max_d + 1.0
+
+        # Site of each user (the sink while uncovered) and its distance to it
+        self.assign = np.full(len(self.users), self.num_sites + 1, dtype=np.int64)
+        self.own = np.zeros(len(self.users))
+        self.load = np.zeros(self.num_sites, dtype=np.int64)
+        self.flow = 0
+
+    def place(self, assign):
+        """Takes `assign` (local site per user) as the current state; unreachable pairs are dropped."""
+        at = assign[self.pair_user]
+        kept = at == self.pair_site
+        self.assign[:] = self.num_sites + 1
+        self.own[:] = 0.0
+        self.assign[self.pair_user[kept]] = at[kept]
+        self.own[self.pair_user[kept]] = self.pair_dist[kept]
+        self.load = np.bincount(at[kept], minlength=self.num_sites)
+        self.flow = int(kept.sum())
+
+    def _arcs(self):
+        """Cost matrix of the current residual arcs; inf where there is none."""
+        S = self.num_sites
+        source, sink = S, S + 1
+        n = S + 2
+        cost = np.full(n * n, INF)
+        # Pair (a, u) prices a -> (u's site), a -> sink if u is uncovered;
+        # a user's pair with its own site lands on the diagonal
+        np.minimum.at(cost, self.pair_row + self.assign[self.pair_user],
+                      self.pair_dist - self.own[self.pair_user])
+        cost = cost.reshape(n, n)
+        np.fill_diagonal(cost, INF)
+
+        farthest = np.full(n, -INF)
+        np.maximum.at(farthest, self.assign, self.own)
+        cost[sink, :S] = -farthest[:S]
+        load = self.load
+        cost[source, :S] = np.where(load < self.g_max, np.where(load < self.mins, -3 * self.big, 0.0), INF)
+        cost[:S, source] = np.where(load > 0, np.where(load <= self.mins, 3 * self.big, 0.0), INF)
+        flow = self.flow
+        cost[sink, source] = -self.big if flow < self.target else (0.0 if flow < len(self.users) else INF)
+        cost[source, sink] = (0.0 if flow > self.target else self.big) if flow > 0 else INF
+        return cost
+
+    def _units(self, u, v):
+        """
+        Costs of the moves arc u -> v offers, with the user each one moves
+        (-1 for the source and return arcs, whose costs come ascending).
+        """
+        S = self.num_sites
+        source, sink = S, S + 1
+        if source in (u, v):
+            other = v if u == source else u
+            if other < S:
+                load, low = int(self.load[other]), int(self.mins[other])
+                if u == source:
+                    costs = _steps(-3 * self.big, low - load, 0.0, self.g_max - max(load, low))
+                else:
+                    costs = _steps(0.0, load - low, 3 * self.big, min(load, low))
+            else:
+                flow = self.flow
+                if u == sink:
+                    costs = _steps(-self.big, self.target - flow, 0.0, len(self.users) - max(flow, self.target))
+                else:
+                    costs = _steps(0.0, flow - self.target, self.big, min(flow, self.target))
+            return costs, np.full(len(costs), -1, dtype=np.int64)
+
+        if u == sink:
+            members = np.flatnonzero(self.assign == v)
+            costs = -self.own[members]
+        else:
+            lo, hi = self.indptr[u], self.indptr[u + 1]
+            users = self.pair_user[lo:hi]
+            sel = self.assign[users] == v
+            members = users[sel]
+            costs = self.pair_dist[lo:hi][sel] - self.own[members]
+        return costs, members
+
+    def _relax(self, cost):
+        """Bellman-Ford from every node at once; the predecessor cycles once there are any."""
+        n = len(cost)
+        dist = np.zeros(n)
+        pred = np.full(n, -1, dtype=np.int64)
+        cols = np.arange(n)
+        rounds = 0
+        while True:
+            rounds += 1
+            through = dist[:, None] + cost
+            frm = through.argmin(axis=0)
+            best = through[frm, cols]
+            better = best < dist - self.EPS
+            if not better.any():
+                return []
+            dist[better] = best[better]
+            pred[better] = frm[better]
+            # Without a negative cycle every distance is final after n - 1 rounds
+            if rounds >= n - 1:
+                cycles = _pred_cycles(pred)
+                if cycles:
+                    return cycles
+
+    def negative_cycles(self):
+        """
+        Node-disjoint improving cycles (first node repeated at the end).
+        Each only touches the users, loads and arcs of its own nodes, so they
+        can all be applied in turn.
+        """
+        cost = self._arcs()
+        return [cycle for cycle in self._relax(cost)
+                if sum(cost[u, v] for u, v in zip(cycle, cycle[1:])) < -self.EPS]
+
+    def apply(self, cycle):
+        """
+        Pushes as many units around `cycle` as still improve it (none if it no
+        longer does). Every node is on the cycle once, so each arc moves users
+        no other arc touches and the k-th unit costs the sum of the arcs' k-th
+        cheapest moves.
+        """
+        S = self.num_sites
+        arcs = list(zip(cycle, cycle[1:]))
+        units = [self._units(u, v) for u, v in arcs]
+        if any(len(costs) == 0 for costs, _ in units):
+            return
+        cheapest = [costs.min() for costs, _ in units]
+        slack = -sum(cheapest)
+        if slack <= self.EPS:
+            return
+        # A unit only improves if none of its moves is more than `slack`
+        # above its arc's cheapest one, so only those are sorted
+        units = [_ascending(costs, users, low + slack) for (costs, users), low in zip(units, cheapest)]
+        k = min(len(costs) for costs, _ in units)
+        total = np.sum([costs[:k] for costs, _ in units], axis=0)
+        k = int(np.searchsorted(total, -self.EPS))
+        for (u, v), (costs, users) in zip(arcs, units):
+            if S in (u, v):
+                # Source arcs only count: a site's load or, with the sink, coverage
+                if v < S:
+                    self.load[v] += k
+                elif u < S:
+                    self.load[u] -= k
+                else:
+                    self.flow += k if u == S + 1 else -k
+                continue
+            moved = users[:k]
+            if u < S:
+                # a -> b or a -> sink: a takes the users, d(a, n) = own + cost
+                self.own[moved] += costs[:k]
+                self.assign[moved] = u
+            else:
+                # sink -> b: b lets them go
+                self.own[moved] = 0.0
+                self.assign[moved] = S + 1
+
+def _ascending(costs, users, limit):
+    """The moves costing less than `limit`, cheapest first."""
+    keep = np.flatnonzero(costs < limit)
+    order = keep[np.argsort(costs[keep], kind='stable')]
+    return costs[order], users[order]
+
+def _steps(first, num_first, then, num_then):
+    """`num_first` units at cost `first`, then `num_then` at cost `then` (negative counts = none)."""
+    return np.concatenate((np.full(max(0, num_first), first), np.full(max(0, num_then), then)))
+
+def _pred_cycles(pred):
+    """The cycles of the predecessor graph, each as [v, ..., v] in arc order."""
+    n = len(pred)
+    state = [0] * n
+    cycles = []
+    for v0 in range(n):
+        v = v0
+        chain = []
+        while v >= 0 and state[v] == 0:
+            state[v] = 1
+            chain.append(v)
+            v = int(pred[v])
+        if v >= 0 and state[v] == 1:
+            # v was reached again on this walk: pred[] closes a cycle through it
+            cycle = [v]
+            w = int(pred[v])
+            while w != v:
+                cycle.append(w)
+                w = int(pred[w])
+            cycle.append(v)
+            cycles.append(cycle[::-1])
+        for w in chain:
+            state[w] = 2
+    return cycles
\ No newline at end of file
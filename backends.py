@@ -0,0 +1,130 @@
+# backends.py
+import os
+import tempfile
+import config
+
+def load_pulp():
+    """PuLP is slow to import and only the ILP needs it, so it loads on first use."""
+    import pulp
+    return pulp
+
+class CbcBackend:
+    """
+    CBC through PuLP's command-line interface. Takes a MIP start and reports
+    bound, node and iteration counts from its log.
+    """
+
+    name = 'cbc'
+    warm_start = True
+
+    def __init__(self, threads=None):
+        self.threads = threads
+
+    def available(self):
+        return load_pulp().PULP_CBC_CMD(msg=0).available()
+
+    def solve(self, prob, time_limit=None, gap=None, warm_start=False):
+        """Solves `prob` in place; returns what the log tells (bound, nodes, iterations, wallclock)."""
+        pulp = load_pulp()
+        log_fd, log_path = tempfile.mkstemp(suffix=".log")
+        os.close(log_fd)
+        try:
+            # The previous incumbent is offered as a MIP start; CBC drops it if it
+            # no longer satisfies the new coverage target.
+            prob.solve(pulp.PULP_CBC_CMD(msg=0, warmStart=warm_start, timeLimit=time_limit,
+                                         gapRel=gap, threads=self.threads, logPath=log_path))
+            return _read_cbc_log(log_path)
+        finally:
+            os.remove(log_path)
+
+class HighsBackend:
+    """
+    HiGHS through PuLP: in-process via highspy when installed, else the
+    `highs` executable. Multithreaded, but PuLP passes it no MIP start.
+    """
+
+    name = 'highs'
+    warm_start = False
+    # highspy runs every model on one process-wide scheduler whose size is
+    # fixed at first use; it is rebuilt when a run asks for another count
+    scheduler_threads = None
+
+    def __init__(self, threads=None):
+        self.threads = threads
+
+    def _solver(self, **options):
+        pulp = load_pulp()
+        solver = pulp.HiGHS(msg=False, threads=self.threads, **options)
+        if solver.available():
+            return solver
+        return pulp.HiGHS_CMD(msg=False, threads=self.threads, **options)
+
+    def available(self):
+        return self._solver().available()
+
+    def solve(self, prob, time_limit=None, gap=None, warm_start=False):
+        """Solves `prob` in place; returns bound, nodes, iterations and wallclock when highspy ran it."""
+        solver = self._solver(timeLimit=time_limit, gapRel=gap)
+        if isinstance(solver, load_pulp().HiGHS) and self.threads != HighsBackend.scheduler_threads:
+            if HighsBackend.scheduler_threads is not None or self.threads is not None:
+                import highspy
+                highspy.Highs.resetGlobalScheduler(True)
+            HighsBackend.scheduler_threads = self.threads
+        prob.solve(solver)
+        model = getattr(prob, 'solverModel', None)
+        if model is None or not hasattr(model, 'getInfo'):
+            return {}
+        info = model.getInfo()
+        if info.primal_solution_status == 0:
+            # PuLP reports a limit hit as solved even when HiGHS has no incumbent
+            pulp = load_pulp()
+            prob.status, prob.sol_status = pulp.LpStatusNotSolved, pulp.LpSolutionNoSolutionFound
+        return {
+            'bound': info.mip_dual_bound,
+            'nodes': info.mip_node_count,
+            'iterations': info.simplex_iteration_count,
+            'wallclock': model.getRunTime(),
+        }
+
+# Backends by name; each is built as backend(threads)
+BACKENDS = {
+    'cbc': CbcBackend,
+    'highs': HighsBackend,
+}
+
+def get_backend(name=None, threads=None):
+    """
+    Backend instance for `name` (default config.SOLVER_BACKEND) using
+    `threads` threads (default config.SOLVER_THREADS; None = solver default).
+    """
+    name = name or config.SOLVER_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown solver backend '{name}' (choose from {', '.join(BACKENDS)})")
+    backend = BACKENDS[name](threads if threads is not None else config.SOLVER_THREADS)
+    if not backend.available():
+        raise RuntimeError(f"Solver backend '{name}' is not installed")
+    return backend
+
+def available_backends():
+    """Names of the backends that can run here."""
+    return [name for name, backend in BACKENDS.items() if backend().available()]
+
+def _read_cbc_log(path):
+    """Picks bound, node/iteration counts and wall time out of CBC's closing summary."""
+    fields = {
+        "Lower bound:": ('bound', float),
+        "Enumerated nodes:": ('nodes', int),
+        "Total iterations:": ('iterations', int),
+    }
+    stats = {}
+    with open(path) as f:
+        for line in f:
+            try:
+                for prefix, (key, kind) in fields.items():
+                    if line.startswith(prefix):
+                        stats[key] = kind(line.split(":", 1)[1])
+                if line.startswith("Total time") and "(Wallclock seconds):" in line:
+                    stats['wallclock'] = float(line.split("(Wallclock seconds):", 1)[1])
+            except ValueError:
+                pass
+    return stats
@@ -0,0 +1,122 @@
+# batch.py
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import config
+import utils
+import algorithms
+import precompute
+
+DEFAULT_BETAS = [0.2, 0.3, 0.4, 0.5, 0.6]
+METRICS = ['conns', 'uavs', 'util', 'time']
+
+def make_jobs(grids, sizes, betas, algos, num_seeds, base_seed, inputs):
+    """
+    One job per (grid, N, seed, beta, algorithm).
+    The scenario seed depends only on (base_seed, grid, N, rep), so every beta
+    and algorithm of a repetition sees the same users, in any worker.
+    """
+    jobs = []
+    for g, grid_type in enumerate(grids):
+        for s, num_users in enumerate(sizes):
+            for rep in range(num_seeds):
+                seed = int(np.random.SeedSequence([base_seed, g, s, rep]).generate_state(1)[0])
+                for beta in betas:
+                    for algo in algos:
+                        job_inputs = dict(inputs, N=num_users, beta=beta)
+                        jobs.append({'grid': grid_type, 'N': num_users, 'rep': rep, 'seed': seed,
+                                     'beta': beta, 'algorithm': algo, 'inputs': job_inputs})
+    return jobs
+
+def run_job(job):
+    """Worker entry point: regenerate the scenario from its seed and solve it."""
+    np.random.seed(job['seed'])
+    users, uavs = utils.generate_scenario(job['N'], job['grid'])
+    candidates = precompute.build_candidate_index(users, uavs, job['inputs']['max_dist'])
+
+    result = algorithms.SOLVERS[job['algorithm']](users, uavs, job['inputs'], candidates)
+    record = {k: job[k] for k in ('grid', 'N', 'rep', 'seed', 'beta', 'algorithm')}
+    record['conns'] = sum(len(v) for v in result[1].values())
+    record['uavs'] = len(result[0])
+    record['util'] = result[2]
+    record['time'] = result[3]
+    return record
+
+def run_batch(jobs, workers=None):
+    """Runs jobs across a process pool; records come back in job order."""
+    if workers == 1:
+        return [run_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_job, jobs, chunksize=1))
+
+def summarize(records, z=1.96):
+    """
+    Mean and confidence half-width of each metric per (grid, N, beta, algorithm).
+    Uses the normal approximation, so keep at least ~10 seeds per cell.
+    """
+    groups = {}
+    for r in records:
+        groups.setdefault((r['grid'], r['N'], r['beta'], r['algorithm']), []).append(r)
+
+    summary = []
+    for (grid_type, num_users, beta, algo), rows in sorted(groups.items()):
+        entry = {'grid': grid_type, 'N': num_users, 'beta': beta, 'algorithm': algo, 'runs': len(rows)}
+        for metric in METRICS:
+            vals = np.array([r[metric] for r in rows], dtype=float)
+            half = z * vals.std(ddof=1) / np.sqrt(len(vals)) if len(vals) > 1 else 0.0
+            entry[metric] = {'mean': float(vals.mean()), 'ci': float(half)}
+        summary.append(entry)
+    return summary
+
+def print_summary(summary):
+    print(f"{'grid':>5} {'N':>6} {'beta':>5} {'algorithm':>10} {'runs':>5} "
+          f"{'conns':>15} {'uavs':>13} {'util':>13} {'time (s)':>17}")
+    for e in summary:
+        cells = [f"{e[m]['mean']:.3f} +/- {e[m]['ci']:.3f}" if m == 'time' else
+                 f"{e[m]['mean']:.1f} +/- {e[m]['ci']:.1f}" for m in METRICS]
+        print(f"{e['grid']:>5} {e['N']:>6} {e['beta']:>5} {e['algorithm']:>10} {e['runs']:>5} "
+              f"{cells[0]:>15} {cells[1]:>13} {cells[2]:>13} {cells[3]:>17}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Monte Carlo runner over seeds x betas x grid sizes.")
+    parser.add_argument('--grids', nargs='+', default=["3x3", "4x4", "5x5"])
+    parser.add_argument('--users', type=int, nargs='+', default=[config.DEFAULT_N_USERS])
+    parser.add_argument('--betas', type=float, nargs='+', default=DEFAULT_BETAS)
+    parser.add_argument('--algorithms', nargs='+', default=['optimal', 'heuristic'], choices=sorted(algorithms.SOLVERS))
+    parser.add_argument('--seeds', type=int, default=10, help="Random scenarios per (grid, N)")
+    parser.add_argument('--seed', type=int, default=0, help="Base seed")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--uav-cost', type=int, default=config.DEFAULT_UAV_COST)
+    parser.add_argument('--budget', type=int, default=config.DEFAULT_BUDGET)
+    parser.add_argument('--max-dist', type=float, default=config.DEFAULT_MAX_DIST)
+    parser.add_argument('--gamma-min', type=int, default=config.GAMMA_MIN)
+    parser.add_argument('--gamma-max', type=int, default=config.GAMMA_MAX)
+    parser.add_argument('--out', help="Write raw records and summary to this JSON file")
+    args = parser.parse_args(argv)
+
+    inputs = {
+        'uav_cost': args.uav_cost,
+        'budget': args.budget,
+        'max_dist': args.max_dist,
+        'gamma_min': args.gamma_min,
+        'gamma_max': args.gamma_max,
+    }
+    jobs = make_jobs(args.grids, args.users, args.betas, args.algorithms, args.seeds, args.seed, inputs)
+
+    print(f"Running {len(jobs)} jobs on {args.workers} workers...")
+    start = time.perf_counter()
+    records = run_batch(jobs, args.workers)
+    print(f"Done in {time.perf_counter() - start:.1f} s")
+
+    summary = summarize(records)
+    print_summary(summary)
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump({'records': records, 'summary': summary}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
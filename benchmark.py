@@ -0,0 +1,521 @@
+# benchmark.py
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+import numpy as np
+import config
+import utils
+import precompute
+import algorithms
+import decompose
+import backends
+from instrument import SolverStats
+from solution import Solution
+
+def _best_of(func, repeats):
+    """Best wall-clock time of `repeats` calls (seconds) and the last result."""
+    best = float('inf')
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def _loop_distances(users, uav_locs, max_dist):
+    """The original per-pair loop used by both solvers."""
+    dists = np.zeros((len(uav_locs), len(users)))
+    potential = {m: [] for m in range(len(uav_locs))}
+    for m in range(len(uav_locs)):
+        for n in range(len(users)):
+            dists[m][n] = utils.calculate_distance(users[n], uav_locs[m])
+            if dists[m][n] <= max_dist:
+                potential[m].append((n, dists[m][n]))
+    return dists, potential
+
+def bench_distances(sizes, grid_type, max_dist, repeats, seed):
+    """Per-pair loop vs. vectorized matrix vs. CSR candidate index."""
+    print(f"{'N':>8} {'M':>5} {'loop (s)':>10} {'matrix (s)':>11} {'index (s)':>10} {'speedup':>8}")
+    for num_users in sizes:
+        np.random.seed(seed)
+        users, uav_locs = utils.generate_scenario(num_users, grid_type)
+
+        t_loop, (ref, _) = _best_of(lambda: _loop_distances(users, uav_locs, max_dist), 1)
+        t_mat, mat = _best_of(lambda: precompute.distance_matrix(users, uav_locs), repeats)
+        t_idx, _ = _best_of(lambda: precompute.build_candidate_index(users, uav_locs, max_dist), repeats)
+
+        assert np.allclose(ref, mat, rtol=0, atol=1e-9), "vectorized distances diverge from the loop"
+        print(f"{num_users:>8} {len(uav_locs):>5} {t_loop:>10.4f} {t_mat:>11.5f} {t_idx:>10.5f} "
+              f"{t_loop / max(t_idx, 1e-9):>7.0f}x")
+
+def bench_scaling(sizes, grid_type, max_dist, repeats, seed):
+    """Blocked pairwise scan vs. bucket-grid radius queries as N grows."""
+    print(f"{'N':>8} {'M':>5} {'nnz':>10} {'dense (s)':>10} {'grid (s)':>9} {'reuse (s)':>10} {'ratio':>7}")
+    for num_users in sizes:
+        np.random.seed(seed)
+        users, uav_locs = utils.generate_scenario(num_users, grid_type)
+
+        t_dense, ref = _best_of(lambda: precompute.build_candidate_index(
+            users, uav_locs, max_dist, method='dense'), repeats)
+        t_grid, idx = _best_of(lambda: precompute.build_candidate_index(
+            users, uav_locs, max_dist, method='grid'), repeats)
+        # Beta sweep case: the bucket grid is built once and only queried again
+        grid = precompute.GridIndex(users, max_dist)
+        t_reuse, _ = _best_of(lambda: precompute.build_candidate_index(
+            users, uav_locs, max_dist, method='grid', grid=grid), repeats)
+
+        assert np.array_equal(ref.indptr, idx.indptr) and np.array_equal(ref.indices, idx.indices), \
+            "grid index disagrees with the pairwise scan"
+        print(f"{num_users:>8} {len(uav_locs):>5} {ref.nnz:>10} {t_dense:>10.4f} {t_grid:>9.4f} "
+              f"{t_reuse:>10.4f} {t_dense / max(t_grid, 1e-9):>6.1f}x")
+
+def _default_inputs(num_users, max_dist):
+    return {
+        'N': num_users,
+        'uav_cost': config.DEFAULT_UAV_COST,
+        'budget': config.DEFAULT_BUDGET,
+        'max_dist': max_dist,
+        'gamma_min': config.GAMMA_MIN,
+        'gamma_max': config.GAMMA_MAX,
+    }
+
+def bench_model_size(sizes, grid_type, max_dist, seed):
+    """ILP dimensions and build time: dense vs. sparse vs. sparse+aggregated."""
+    variants = [
+        ('dense', dict(sparse=False)),
+        ('sparse', dict(sparse=True)),
+        ('aggregated', dict(sparse=True, aggregated=True)),
+    ]
+    print(f"{'N':>8} {'M':>5} {'variant':>11} {'rows':>9} {'columns':>9} {'nonzeros':>10} {'build (s)':>10}")
+    for num_users in sizes:
+        np.random.seed(seed)
+        users, uav_locs = utils.generate_scenario(num_users, grid_type)
+        inputs = _default_inputs(num_users, max_dist)
+        candidates = precompute.build_candidate_index(users, uav_locs, max_dist)
+
+        for name, options in variants:
+            start = time.perf_counter()
+            model = algorithms.DeploymentModel(users, uav_locs, inputs, candidates, **options)
+            elapsed = time.perf_counter() - start
+            size = model.size()
+            print(f"{num_users:>8} {len(uav_locs):>5} {name:>11} {size['rows']:>9} {size['columns']:>9} "
+                  f"{size['nonzeros']:>10} {elapsed:>10.3f}")
+
+def bench_greedy(sizes, grid_type, max_dist, beta, gamma_max, repeats, seed):
+    """Static-ranking greedy vs. lazy greedy: runtime and solution quality."""
+    print(f"{'N':>8} {'M':>5} {'greedy (s)':>11} {'lazy (s)':>9} {'uavs':>9} {'conns':>13} {'utility':>9}")
+    for num_users in sizes:
+        np.random.seed(seed)
+        users, uav_locs = utils.generate_scenario(num_users, grid_type)
+        inputs = dict(_default_inputs(num_users, max_dist), beta=beta, gamma_max=gamma_max,
+                      budget=len(uav_locs) * config.DEFAULT_UAV_COST)
+        candidates = precompute.build_candidate_index(users, uav_locs, max_dist)
+
+        t_greedy, greedy = _best_of(lambda: algorithms.solve_heuristic(users, uav_locs, inputs, candidates), repeats)
+        t_lazy, lazy = _best_of(lambda: algorithms.solve_heuristic_lazy(users, uav_locs, inputs, candidates), repeats)
+
+        conns = lambda res: sum(len(v) for v in res[1].values())
+        print(f"{num_users:>8} {len(uav_locs):>5} {t_greedy:>11.4f} {t_lazy:>9.4f} "
+              f"{len(greedy[0]):>4}/{len(lazy[0]):<4} {conns(greedy):>6}/{conns(lazy):<6} {greedy[2]:>4}/{lazy[2]:<4}")
+
+def bench_hybrid(sizes, grid_type, max_dist, beta, gamma_max, cbc_max, seed):
+    """Greedy vs. greedy + exact assignment (hybrid) vs. CBC: runtime, utility and total distance."""
+    print(f"{'N':>8} {'M':>5} {'greedy (s)':>11} {'hybrid (s)':>11} {'cbc (s)':>8} {'uavs':>8} {'utility':>11} "
+          f"{'greedy dist':>12} {'hybrid dist':>12} {'cbc dist':>12}")
+    for num_users in sizes:
+        np.random.seed(seed)
+        users, uav_locs = utils.generate_scenario(num_users, grid_type)
+        inputs = dict(_default_inputs(num_users, max_dist), beta=beta, gamma_max=gamma_max,
+                      budget=len(uav_locs) * config.DEFAULT_UAV_COST)
+        candidates = precompute.build_candidate_index(users, uav_locs, max_dist)
+
+        t_greedy, greedy = _best_of(lambda: algorithms.solve_heuristic(users, uav_locs, inputs, candidates), 1)
+        t_hybrid, hybrid = _best_of(lambda: algorithms.solve_hybrid(users, uav_locs, inputs, candidates), 1)
+        results = [greedy, hybrid]
+        # CBC only up to cbc_max users; past that it runs for minutes
+        t_cbc = None
+        if num_users <= cbc_max:
+            t_cbc, cbc = _best_of(lambda: algorithms.solve_optimal(users, uav_locs, inputs, candidates), 1)
+            results.append(cbc)
+
+        dist = lambda res: Solution.from_result(users, uav_locs, res).total_dist if res[0] else float('nan')
+        dists = [f"{dist(res):>12.1f}" for res in results] + [f"{'-':>12}"] * (3 - len(results))
+        uavs = "/".join(str(len(res[0])) for res in results)
+        utility = "/".join(str(res[2]) for res in results)
+        cbc_time = f"{t_cbc:>8.3f}" if t_cbc is not None else f"{'-':>8}"
+        print(f"{num_users:>8} {len(uav_locs):>5} {t_greedy:>11.3f} {t_hybrid:>11.3f} {cbc_time} {uavs:>8} "
+              f"{utility:>11} {' '.join(dists)}")
+
+def bench_decompose(sizes, grid_type, max_dist, beta, algo, tiles, workers, seed):
+    """Monolithic solve vs. tiled decomposition: runtime and quality gap."""
+    print(f"{'N':>8} {'M':>5} {'tiles':>5} {'mono (s)':>9} {'tiled (s)':>10} {'uavs':>11} {'conns':>13} "
+          f"{'utility':>9} {'gap':>7}")
+    for num_users in sizes:
+        np.random.seed(seed)
+        users, uav_locs = utils.generate_scenario(num_users, grid_type)
+        inputs = dict(_default_inputs(num_users, max_dist), beta=beta,
+                      budget=len(uav_locs) * config.DEFAULT_UAV_COST)
+        candidates = precompute.build_candidate_index(users, uav_locs, max_dist)
+        shape = tiles or decompose.default_tile_shape(len(uav_locs))
+
+        t_mono, mono = _best_of(lambda: algorithms.SOLVERS[algo](users, uav_locs, inputs, candidates), 1)
+        t_tiled, tiled = _best_of(lambda: decompose.solve_decomposed(
+            users, uav_locs, inputs, candidates, shape, algo, workers), 1)
+
+        conns = lambda res: sum(len(v) for v in res[1].values())
+        # Utility is minimized; a positive gap means the tiled solution is worse.
+        # Taken on the unrounded utility, which the integer score often hides.
+        def raw(res):
+            sol = Solution.from_result(users, uav_locs, res)
+            return utils.weighted_utility_batch(sol.num_active, sol.conn_count, sol.total_dist,
+                                                inputs, len(uav_locs))['raw']
+        gap = (raw(tiled) - raw(mono)) / raw(mono) if raw(mono) else float('nan')
+        print(f"{num_users:>8} {len(uav_locs):>5} {shape[0]:>2}x{shape[1]:<2} {t_mono:>9.3f} {t_tiled:>10.3f} "
+              f"{len(mono[0]):>5}/{len(tiled[0]):<5} {conns(mono):>6}/{conns(tiled):<6} "
+              f"{mono[2]:>4}/{tiled[2]:<4} {gap:>6.1%}")
+
+def bench_bnb(sizes, grids, betas, max_dist, time_limit, seed):
+    """CBC (through PuLP) vs. the in-process branch and bound: runtime and objective."""
+    print(f"{'N':>6} {'grid':>5} {'beta':>5} {'cbc (s)':>8} {'bnb (s)':>8} {'nodes':>6} "
+          f"{'cbc objective':>14} {'bnb objective':>14} {'match':>6}")
+    for num_users, grid_type in itertools.product(sizes, grids):
+        np.random.seed(seed)
+        users, uav_locs = utils.generate_scenario(num_users, grid_type)
+        candidates = precompute.build_candidate_index(users, uav_locs, max_dist)
+        for beta in betas:
+            inputs = dict(_default_inputs(num_users, max_dist), beta=beta)
+
+            model = algorithms.DeploymentModel(users, uav_locs, inputs, candidates)
+            t_cbc, cbc = _best_of(lambda: model.solve(beta), 1)
+            stats = SolverStats()
+            t_bnb, bnb = _best_of(lambda: algorithms.solve_branch_and_bound(
+                users, uav_locs, inputs, candidates, time_limit=time_limit, stats=stats), 1)
+
+            cbc_obj = model.quality['objective'] if cbc[0] else None
+            bnb_obj = stats.counters.get('objective') if bnb[0] else None
+            if cbc_obj is None or bnb_obj is None:
+                match = 'yes' if cbc_obj is None and bnb_obj is None else 'NO'
+            else:
+                match = 'yes' if abs(cbc_obj - bnb_obj) <= 1e-6 * max(1.0, abs(cbc_obj)) else 'NO'
+            fmt = lambda v: f"{v:>14.3f}" if v is not None else f"{'infeasible':>14}"
+            print(f"{num_users:>6} {grid_type:>5} {beta:>5} {t_cbc:>8.3f} {t_bnb:>8.3f} "
+                  f"{stats.counters.get('bnb_nodes', 0):>6} {fmt(cbc_obj)} {fmt(bnb_obj)} {match:>6}")
+
+def bench_utility(batch_sizes, num_users, grid_type, max_dist, repeats, seed):
+    """Scalar calculate_weighted_utility per solution vs. one batched evaluation."""
+    print(f"{'batch':>8} {'N':>6} {'loop (s)':>9} {'batch (s)':>10} {'speedup':>8}")
+    # Both sides gather distances from one precomputed matrix
+    np.random.seed(seed)
+    users, uav_locs = utils.generate_scenario(num_users, grid_type)
+    inputs = _default_inputs(num_users, max_dist)
+    dist_matrix = precompute.distance_matrix(users, uav_locs)
+    rng = np.random.default_rng(seed)
+    for batch in batch_sizes:
+        # Random deployments: a few open sites, each user on one of them or uncovered
+        active = rng.random((batch, len(uav_locs))) < 0.3
+        choice = rng.integers(0, len(uav_locs), (batch, num_users))
+        assignments = np.where(active[np.arange(batch)[:, None], choice] & (rng.random((batch, num_users)) < 0.5),
+                               choice, -1)
+
+        def loop():
+            scores = []
+            for a, act in zip(assignments, active):
+                linked = np.flatnonzero(a >= 0)
+                dist = float(dist_matrix[a[linked], linked].sum())
+                scores.append(utils.calculate_weighted_utility(int(act.sum()), len(linked), dist, inputs, len(uav_locs)))
+            return scores
+
+        t_loop, ref = _best_of(loop, repeats)
+        t_batch, res = _best_of(lambda: utils.evaluate_solutions(
+            assignments, active, users, uav_locs, inputs, dist_matrix), repeats)
+        assert ref == res['utility'].tolist(), "batched utility disagrees with calculate_weighted_utility"
+        print(f"{batch:>8} {num_users:>6} {t_loop:>9.4f} {t_batch:>10.5f} {t_loop / max(t_batch, 1e-9):>7.1f}x")
+
+STARTUP_MODULES = ['numpy', 'algorithms', 'main', 'pulp', 'matplotlib.pyplot']
+
+def _fresh_process_seconds(cmd, env=None):
+    """
+    (wall time, stdout, stderr) of one fresh process; the time is None if it
+    exited non-zero (e.g. no display).
+    """
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, env=env, cwd=os.path.dirname(os.path.abspath(__file__)),
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    elapsed = time.perf_counter() - start
+    return (elapsed if proc.returncode == 0 else None), proc.stdout, proc.stderr
+
+def _failure(stderr):
+    """Last line of a failed child's stderr, for a one-line report."""
+    lines = stderr.strip().splitlines()
+    return lines[-1] if lines else "no error output"
+
+def bench_startup(repeats, exe=None):
+    """
+    Cold-start costs, each measured in fresh processes (median of `repeats`):
+    import time of the app and its heavy dependencies, then time to first
+    window and to ready plots. `exe` times a frozen build instead of main.py.
+    """
+    print(f"{'import':<20} {'median (s)':>11}")
+    for module in STARTUP_MODULES:
+        code = (f"import time, sys; t = time.perf_counter(); import {module}; "
+                f"print(time.perf_counter() - t, 'pulp' in sys.modules, 'matplotlib' in sys.modules)")
+        runs = [_fresh_process_seconds([sys.executable, '-c', code]) for _ in range(repeats)]
+        failed = [stderr for elapsed, _, stderr in runs if elapsed is None]
+        if failed:
+            print(f"{module:<20} {'failed':>11}  ({_failure(failed[0])})")
+            continue
+        runs = [stdout.split() for _, stdout, _ in runs]
+        seconds = float(np.median([float(r[0]) for r in runs]))
+        note = "" if module != 'main' else f"  (pulp loaded: {runs[0][1]}, matplotlib loaded: {runs[0][2]})"
+        print(f"{module:<20} {seconds:>11.3f}{note}")
+
+    cmd = [exe] if exe else [sys.executable, 'main.py']
+    print(f"{'launch':<20} {'median (s)':>11}")
+    for stage in ('window', 'plots'):
+        env = dict(os.environ, UAV_SIM_STARTUP_PROBE=stage)
+        runs = [_fresh_process_seconds(cmd, env) for _ in range(repeats)]
+        times = [elapsed for elapsed, _, _ in runs]
+        if None in times:
+            stderr = runs[times.index(None)][2]
+            print(f"{'first ' + stage:<20} {'n/a':>11}  (could not open a window: {_failure(stderr)})")
+        else:
+            print(f"{'first ' + stage:<20} {float(np.median(times)):>11.3f}")
+
+def bench_backends(sizes, grids, betas, max_dist, names, threads, time_limit, gap, seed):
+    """MILP backends and thread counts on the same models: solve time, objective and agreement."""
+    names = names or backends.available_backends()
+    print(f"{'N':>6} {'grid':>5} {'beta':>5} {'backend':>8} {'threads':>7} {'solve (s)':>10} {'io (s)':>7} "
+          f"{'nodes':>7} {'status':>10} {'objective':>14} {'match':>6}")
+    for num_users, grid_type in itertools.product(sizes, grids):
+        np.random.seed(seed)
+        users, uav_locs = utils.generate_scenario(num_users, grid_type)
+        candidates = precompute.build_candidate_index(users, uav_locs, max_dist)
+        for beta in betas:
+            inputs = dict(_default_inputs(num_users, max_dist), beta=beta)
+            reference = None
+            for name, num_threads in itertools.product(names, threads):
+                # Fresh model per run so no backend starts from another's incumbent
+                model = algorithms.DeploymentModel(users, uav_locs, inputs, candidates)
+                stats = SolverStats()
+                model.solve(beta, time_limit=time_limit, gap=gap, stats=stats, backend=name, threads=num_threads)
+                objective = model.quality['objective']
+                if reference is None:
+                    reference = objective
+                if objective is None or reference is None:
+                    match = 'yes' if objective is None and reference is None else 'NO'
+                else:
+                    match = 'yes' if abs(objective - reference) <= 1e-6 * max(1.0, abs(reference)) else 'NO'
+                fmt = f"{objective:>14.3f}" if objective is not None else f"{'infeasible':>14}"
+                print(f"{num_users:>6} {grid_type:>5} {beta:>5} {name:>8} {num_threads:>7} "
+                      f"{stats.phases.get(name + '_solve', 0):>10.3f} {stats.phases.get(name + '_io', 0):>7.3f} "
+                      f"{stats.counters.get(name + '_nodes', 0):>7} {model.quality['status']:>10} {fmt} {match:>6}")
+
+def _timed_runs(func, warmups, repeats):
+    """perf_counter timings of `repeats` calls after `warmups` untimed ones."""
+    for _ in range(warmups):
+        func()
+    times = []
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return times, result
+
+def run_suite(algos, sizes, grids, max_dists, betas, warmups, repeats, seed):
+    """
+    Fixed-seed sweep over N x grid x max_dist x beta for each solver.
+    Returns {case_key: {median_s, min_s, utility, conns, uavs}}.
+    """
+    results = {}
+    for num_users, grid_type, max_dist in itertools.product(sizes, grids, max_dists):
+        np.random.seed(seed)
+        users, uav_locs = utils.generate_scenario(num_users, grid_type)
+        candidates = precompute.build_candidate_index(users, uav_locs, max_dist)
+        for beta, algo in itertools.product(betas, algos):
+            inputs = dict(_default_inputs(num_users, max_dist), beta=beta)
+            solver = algorithms.SOLVERS[algo]
+            times, res = _timed_runs(lambda: solver(users, uav_locs, inputs, candidates), warmups, repeats)
+            # One extra instrumented run so the timed ones carry no overhead
+            stats = SolverStats()
+            solver(users, uav_locs, inputs, candidates, stats=stats)
+
+            key = f"{algo}|{grid_type}|N={num_users}|d={max_dist:g}|beta={beta:g}"
+            results[key] = {
+                'median_s': float(np.median(times)),
+                'min_s': float(min(times)),
+                'utility': res[2],
+                'conns': sum(len(v) for v in res[1].values()),
+                'uavs': len(res[0]),
+                'stats': stats.as_dict(),
+            }
+            print(f"{key:<45} {results[key]['median_s']:>9.4f} s  util={res[2]:<3} "
+                  f"conns={results[key]['conns']:<5} uavs={results[key]['uavs']}")
+            print(f"{'':<45} {stats.summary()}")
+    return results
+
+def compare_to_baseline(results, baseline, threshold, noise_floor):
+    """
+    Flags cases whose median time grew by more than `threshold` (relative and
+    above `noise_floor` seconds) or whose utility got worse (it is minimized).
+    Returns the number of regressions.
+    """
+    regressions = 0
+    for key, cur in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        notes = []
+        slower = cur['median_s'] - base['median_s']
+        if slower > noise_floor and cur['median_s'] > base['median_s'] * (1 + threshold):
+            notes.append(f"SLOWER {base['median_s']:.4f}s -> {cur['median_s']:.4f}s")
+        if cur['utility'] > base['utility']:
+            notes.append(f"QUALITY utility {base['utility']} -> {cur['utility']}")
+        if notes:
+            regressions += 1
+            print(f"REGRESSION {key}: " + "; ".join(notes))
+    print(f"{regressions} regression(s) against {len(baseline)} baseline case(s)")
+    return regressions
+
+def bench_suite(args):
+    results = run_suite(args.algorithms, args.sizes, args.grids, args.max_dists, args.betas,
+                        args.warmups, args.repeats, args.seed)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'cases': results}, f, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['cases']
+        if compare_to_baseline(results, baseline, args.threshold, args.noise_floor):
+            sys.exit(1)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Performance benchmarks for the UAV deployment solvers.")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_dist = sub.add_parser('distances', help="Distance precomputation: loop vs. vectorized")
+    p_dist.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 5000])
+    p_dist.add_argument('--grid', default="5x5")
+    p_dist.add_argument('--max-dist', type=float, default=300)
+    p_dist.add_argument('--repeats', type=int, default=5)
+    p_dist.add_argument('--seed', type=int, default=0)
+
+    p_scale = sub.add_parser('scaling', help="Candidate index: pairwise scan vs. spatial grid")
+    p_scale.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    p_scale.add_argument('--grid', default="9x9")
+    p_scale.add_argument('--max-dist', type=float, default=50)
+    p_scale.add_argument('--repeats', type=int, default=3)
+    p_scale.add_argument('--seed', type=int, default=0)
+
+    p_size = sub.add_parser('model-size', help="ILP rows/columns/nonzeros per formulation")
+    p_size.add_argument('--sizes', type=int, nargs='+', default=[100, 500, 1000])
+    p_size.add_argument('--grid', default="5x5")
+    p_size.add_argument('--max-dist', type=float, default=300)
+    p_size.add_argument('--seed', type=int, default=0)
+
+    p_greedy = sub.add_parser('greedy', help="Greedy heuristic vs. lazy greedy")
+    p_greedy.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    p_greedy.add_argument('--grid', default="9x9")
+    p_greedy.add_argument('--max-dist', type=float, default=150)
+    p_greedy.add_argument('--beta', type=float, default=0.5)
+    p_greedy.add_argument('--gamma-max', type=int, default=5000)
+    p_greedy.add_argument('--repeats', type=int, default=3)
+    p_greedy.add_argument('--seed', type=int, default=0)
+
+    p_hyb = sub.add_parser('hybrid', help="Greedy vs. hybrid (greedy + exact assignment) vs. CBC")
+    p_hyb.add_argument('--sizes', type=int, nargs='+', default=[200, 1000, 10000, 100000])
+    p_hyb.add_argument('--grid', default="4x4")
+    p_hyb.add_argument('--max-dist', type=float, default=300)
+    p_hyb.add_argument('--beta', type=float, default=0.5)
+    p_hyb.add_argument('--gamma-max', type=int, default=5000)
+    p_hyb.add_argument('--cbc-max', type=int, default=1000, help="Largest N also solved with CBC")
+    p_hyb.add_argument('--seed', type=int, default=0)
+
+    p_dec = sub.add_parser('decompose', help="Monolithic solve vs. spatial decomposition")
+    p_dec.add_argument('--sizes', type=int, nargs='+', default=[100, 200, 300])
+    p_dec.add_argument('--grid', default="6x6")
+    p_dec.add_argument('--max-dist', type=float, default=150)
+    p_dec.add_argument('--beta', type=float, default=0.5)
+    p_dec.add_argument('--algorithm', default='optimal', choices=sorted(algorithms.SOLVERS))
+    p_dec.add_argument('--tiles', type=utils.parse_grid, help="Tile grid as RxC (default: by site count, at least 2x2)")
+    p_dec.add_argument('--workers', type=int, help="Tile solver processes (1 = in-process)")
+    p_dec.add_argument('--seed', type=int, default=0)
+
+    p_bnb = sub.add_parser('bnb', help="CBC vs. in-process branch and bound")
+    p_bnb.add_argument('--sizes', type=int, nargs='+', default=[30, 50, 100])
+    p_bnb.add_argument('--grids', nargs='+', default=["3x3", "4x4"])
+    p_bnb.add_argument('--betas', type=float, nargs='+', default=[0.2, 0.4, 0.6])
+    p_bnb.add_argument('--max-dist', type=float, default=300)
+    p_bnb.add_argument('--time-limit', type=float, help="Stop the branch and bound after this many seconds")
+    p_bnb.add_argument('--seed', type=int, default=0)
+
+    p_util = sub.add_parser('utility', help="Scalar vs. batched utility evaluation")
+    p_util.add_argument('--batches', type=int, nargs='+', default=[100, 1000, 10000])
+    p_util.add_argument('--users', type=int, default=200)
+    p_util.add_argument('--grid', default="5x5")
+    p_util.add_argument('--max-dist', type=float, default=300)
+    p_util.add_argument('--repeats', type=int, default=3)
+    p_util.add_argument('--seed', type=int, default=0)
+
+    p_start = sub.add_parser('startup', help="Import time and time-to-first-window of the GUI")
+    p_start.add_argument('--repeats', type=int, default=5)
+    p_start.add_argument('--exe', help="Time this frozen executable instead of main.py")
+
+    p_back = sub.add_parser('backends', help="MILP backends and thread counts on the same models")
+    p_back.add_argument('--sizes', type=int, nargs='+', default=[100, 200])
+    p_back.add_argument('--grids', nargs='+', default=["4x4", "5x5"])
+    p_back.add_argument('--betas', type=float, nargs='+', default=[0.4, 0.6])
+    p_back.add_argument('--max-dist', type=float, default=300)
+    p_back.add_argument('--backends', nargs='+', choices=sorted(backends.BACKENDS),
+                        help="Backends to compare (default: every installed one)")
+    p_back.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4])
+    p_back.add_argument('--time-limit', type=float, help="Per-solve limit in seconds")
+    p_back.add_argument('--gap', type=float, help="Stop at this relative gap")
+    p_back.add_argument('--seed', type=int, default=0)
+
+    p_suite = sub.add_parser('suite', help="Solver sweep with JSON baselines and regression checks")
+    p_suite.add_argument('--algorithms', nargs='+', default=['optimal', 'heuristic'], choices=sorted(algorithms.SOLVERS))
+    p_suite.add_argument('--sizes', type=int, nargs='+', default=[50, 100, 200])
+    p_suite.add_argument('--grids', nargs='+', default=["3x3", "4x4", "5x5"])
+    p_suite.add_argument('--max-dists', type=float, nargs='+', default=[200, 300])
+    p_suite.add_argument('--betas', type=float, nargs='+', default=[0.2, 0.4, 0.6])
+    p_suite.add_argument('--warmups', type=int, default=1)
+    p_suite.add_argument('--repeats', type=int, default=5)
+    p_suite.add_argument('--seed', type=int, default=0)
+    p_suite.add_argument('--save', help="Write results as a JSON baseline")
+    p_suite.add_argument('--compare', help="Baseline JSON to check against (exit code 1 on regression)")
+    p_suite.add_argument('--threshold', type=float, default=0.2, help="Allowed relative slowdown")
+    p_suite.add_argument('--noise-floor', type=float, default=0.005, help="Ignore slowdowns below this (s)")
+
+    args = parser.parse_args(argv)
+    if args.command == 'distances':
+        bench_distances(args.sizes, args.grid, args.max_dist, args.repeats, args.seed)
+    elif args.command == 'scaling':
+        bench_scaling(args.sizes, args.grid, args.max_dist, args.repeats, args.seed)
+    elif args.command == 'model-size':
+        bench_model_size(args.sizes, args.grid, args.max_dist, args.seed)
+    elif args.command == 'greedy':
+        bench_greedy(args.sizes, args.grid, args.max_dist, args.beta, args.gamma_max, args.repeats, args.seed)
+    elif args.command == 'hybrid':
+        bench_hybrid(args.sizes, args.grid, args.max_dist, args.beta, args.gamma_max, args.cbc_max, args.seed)
+    elif args.command == 'decompose':
+        bench_decompose(args.sizes, args.grid, args.max_dist, args.beta, args.algorithm, args.tiles,
+                        args.workers, args.seed)
+    elif args.command == 'bnb':
+        bench_bnb(args.sizes, args.grids, args.betas, args.max_dist, args.time_limit, args.seed)
+    elif args.command == 'utility':
+        bench_utility(args.batches, args.users, args.grid, args.max_dist, args.repeats, args.seed)
+    elif args.command == 'startup':
+        bench_startup(args.repeats, args.exe)
+    elif args.command == 'backends':
+        bench_backends(args.sizes, args.grids, args.betas, args.max_dist, args.backends, args.threads,
+                       args.time_limit, args.gap, args.seed)
+    elif args.command == 'suite':
+        bench_suite(args)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
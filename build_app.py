@@ -1,13 +1,20 @@
 # build_app.py
+import argparse
 import PyInstaller.__main__
 import os
 
+parser = argparse.ArgumentParser(description="Builds the desktop executable with PyInstaller.")
+parser.add_argument('--onedir', action='store_true',
+                    help="Folder build: nothing is unpacked at launch, so it starts much faster")
+args = parser.parse_args()
+
 print("--- STARTING BUILD PROCESS (NO CPLEX) ---")
 
 PyInstaller.__main__.run([
     'main.py',
     '--name=UAV_Disaster_Sim',
-    '--onefile',
+    # --onefile unpacks itself to a temp folder on every launch
+    '--onedir' if args.onedir else '--onefile',
     '--windowed',
     '--noconfirm',
     '--clean',
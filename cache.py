@@ -0,0 +1,97 @@
+# cache.py
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+import numpy as np
+import config
+
+def result_key(users, uav_locs, inputs, algorithm, options=None):
+    """
+    Content hash of everything a solve depends on: the user and site arrays
+    (values, dtype and shape), the inputs dict (including beta), the solver
+    name and any solver options such as a time budget.
+    """
+    h = hashlib.sha256()
+    for arr in (users, uav_locs):
+        arr = np.ascontiguousarray(arr)
+        h.update(f"{arr.dtype.str}{arr.shape}".encode())
+        h.update(arr.tobytes())
+    meta = {'inputs': inputs, 'algorithm': algorithm, 'options': options or {}}
+    h.update(json.dumps(meta, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+class ResultCache:
+    """
+    LRU cache of solver results keyed by result_key().
+    With `directory` set, entries are also pickled to disk and survive
+    restarts; the in-memory LRU then acts as the hot layer in front of it.
+    """
+
+    def __init__(self, max_entries=config.CACHE_MAX_ENTRIES, directory=None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".pkl")
+
+    def get(self, key):
+        """Cached value or None."""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        if self.directory and os.path.exists(self._path(key)):
+            try:
+                with open(self._path(key), 'rb') as f:
+                    value = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                value = None
+            if value is not None:
+                self._remember(key, value)
+                self.hits += 1
+                return value
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self._remember(key, value)
+        if self.directory:
+            # Write-then-rename so a crash never leaves a torn entry behind
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+
+    def get_or_compute(self, key, compute, bypass=False):
+        """
+        Returns the cached value, or computes and stores it.
+        bypass=True always computes and leaves the cache untouched, for timing runs.
+        """
+        if bypass:
+            return compute()
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        self.entries.clear()
+        if self.directory:
+            for name in os.listdir(self.directory):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(self.directory, name))
+
+    def _remember(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
@@ -0,0 +1,161 @@
+# cli.py
+import argparse
+import csv
+import json
+import os
+import sys
+import numpy as np
+import config
+import utils
+import precompute
+import algorithms
+import backends
+from instrument import SolverStats
+import cache
+
+DEFAULT_BETAS = [0.2, 0.3, 0.4, 0.5, 0.6]
+PARAM_TYPES = {'uav_cost': int, 'budget': int, 'max_dist': float, 'gamma_min': int, 'gamma_max': int}
+PARAM_KEYS = list(PARAM_TYPES)
+# Solvers that run a MILP backend and take backend/threads options
+MILP_SOLVERS = ('optimal', 'anytime')
+
+def default_params():
+    return {
+        'uav_cost': config.DEFAULT_UAV_COST,
+        'budget': config.DEFAULT_BUDGET,
+        'max_dist': config.DEFAULT_MAX_DIST,
+        'gamma_min': config.GAMMA_MIN,
+        'gamma_max': config.GAMMA_MAX,
+    }
+
+def load_scenario(path):
+    """
+    Reads (users, uav_locs, params) from a scenario file.
+    .json: {"users": [[x, y], ...], "uav_locs": [[x, y], ...], "params": {...}}
+    .npz:  arrays 'users' and 'uav_locs', plus optional scalar params
+    .csv:  rows of kind,x,y with kind 'user' or 'uav' (header optional)
+    """
+    ext = os.path.splitext(path)[1].lower()
+    params = {}
+    if ext == '.json':
+        with open(path) as f:
+            data = json.load(f)
+        users, uav_locs = data['users'], data['uav_locs']
+        params = data.get('params', {})
+    elif ext == '.npz':
+        with np.load(path) as data:
+            users, uav_locs = data['users'], data['uav_locs']
+            params = {k: data[k].item() for k in PARAM_KEYS if k in data}
+    elif ext == '.csv':
+        users, uav_locs = [], []
+        with open(path, newline='') as f:
+            for row in csv.reader(f):
+                if not row or row[0].strip().lower() not in ('user', 'uav'):
+                    continue
+                point = [float(row[1]), float(row[2])]
+                (users if row[0].strip().lower() == 'user' else uav_locs).append(point)
+    else:
+        raise ValueError(f"Unsupported scenario format: {path}")
+
+    users = np.asarray(users, dtype=float).reshape(-1, 2)
+    uav_locs = np.asarray(uav_locs, dtype=float).reshape(-1, 2)
+    return users, uav_locs, params
+
+def iter_scenarios(args):
+    """Yields (name, users, uav_locs, params) from files, then generated seeds."""
+    for path in args.scenario:
+        users, uav_locs, params = load_scenario(path)
+        yield path, users, uav_locs, params
+
+    if args.generate:
+        for k in range(args.runs):
+            seed = args.seed + k
+            np.random.seed(seed)
+            users, uav_locs = utils.generate_scenario(args.generate, args.grid, args.distribution)
+            yield f"{args.grid}/{args.distribution}/N={args.generate}/seed={seed}", users, uav_locs, {}
+
+def _json_default(value):
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless solver runs; one JSON line per (scenario, beta, algorithm).")
+    parser.add_argument('scenario', nargs='*', help="Scenario files (.json, .csv, .npz)")
+    parser.add_argument('--generate', type=int, metavar='N', help="Also generate random scenarios with N users")
+    parser.add_argument('--grid', default="4x4", help="Candidate grid for generated scenarios")
+    parser.add_argument('--distribution', default='uniform', choices=['uniform', 'clustered'],
+                        help="Victim layout for generated scenarios")
+    parser.add_argument('--runs', type=int, default=1, help="Generated scenarios (seeds seed..seed+runs-1)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--betas', type=float, nargs='+', default=DEFAULT_BETAS)
+    parser.add_argument('--algorithms', nargs='+', default=['optimal', 'heuristic'], choices=sorted(algorithms.SOLVERS))
+    for key, kind in PARAM_TYPES.items():
+        parser.add_argument('--' + key.replace('_', '-'), type=kind, dest=key,
+                            help="Overrides the scenario file and config default")
+    parser.add_argument('--backend', choices=sorted(backends.BACKENDS),
+                        help="MILP solver for %s (default: config.SOLVER_BACKEND)" % "/".join(MILP_SOLVERS))
+    parser.add_argument('--threads', type=int, help="Threads of the MILP solver (default: config.SOLVER_THREADS)")
+    parser.add_argument('--stats', action='store_true', help="Add per-phase timings and model counters")
+    parser.add_argument('--no-connections', action='store_true', help="Omit per-site user lists from the output")
+    parser.add_argument('--cache-dir', help="Reuse results stored here by earlier runs (and store new ones)")
+    parser.add_argument('--no-cache', action='store_true', help="Solve everything again and leave --cache-dir untouched")
+    parser.add_argument('--out', help="Write JSON Lines here instead of stdout")
+    args = parser.parse_args(argv)
+
+    if not args.scenario and not args.generate:
+        parser.error("give scenario files and/or --generate N")
+
+    milp_options = {k: v for k, v in (('backend', args.backend), ('threads', args.threads)) if v is not None}
+    result_cache = cache.ResultCache(directory=args.cache_dir) if args.cache_dir else None
+    out = open(args.out, 'w') if args.out else sys.stdout
+    try:
+        for name, users, uav_locs, file_params in iter_scenarios(args):
+            # Precedence: command line > scenario file > config defaults
+            params = dict(default_params(), **file_params)
+            params.update({k: getattr(args, k) for k in PARAM_KEYS if getattr(args, k) is not None})
+            candidates = precompute.build_candidate_index(users, uav_locs, params['max_dist'])
+
+            for beta in args.betas:
+                inputs = dict(params, N=len(users), beta=beta)
+                for algo in args.algorithms:
+                    stats = SolverStats() if args.stats else None
+                    options = milp_options if algo in MILP_SOLVERS else {}
+                    solve = lambda: algorithms.SOLVERS[algo](users, uav_locs, inputs, candidates, stats=stats,
+                                                             **options)[:4]
+                    # --no-cache solves every run, e.g. so --stats timings are real
+                    cached = False
+                    if result_cache is not None and not args.no_cache:
+                        key = cache.result_key(users, uav_locs, inputs, algo, options)
+                        solve_result = result_cache.get(key)
+                        cached = solve_result is not None
+                        if not cached:
+                            solve_result = solve()
+                            result_cache.put(key, solve_result)
+                    else:
+                        solve_result = solve()
+                    active, conns, utility, runtime = solve_result
+                    record = {
+                        'scenario': name, 'beta': beta, 'algorithm': algo,
+                        'N': len(users), 'M': len(uav_locs),
+                        'uavs': len(active), 'conns': sum(len(v) for v in conns.values()),
+                        'utility': utility, 'runtime': runtime,
+                        'active': active,
+                    }
+                    if cached:
+                        # Nothing was solved, so there are no stats either
+                        record['cached'] = True
+                    elif stats is not None:
+                        record['stats'] = stats.as_dict()
+                    if not args.no_connections:
+                        record['connections'] = {str(m): v for m, v in conns.items()}
+                    out.write(json.dumps(record, default=_json_default) + "\n")
+                    out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
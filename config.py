@@ -4,6 +4,19 @@
 GRID_WIDTH = 1000   # Meters (X-axis limit)
 GRID_HEIGHT = 1000  # Meters (Y-axis limit)
 
+# --- Scenario Generation ---
+GEN_CHUNK_SIZE = 1_000_000  # Users drawn per chunk when generating large scenarios
+HOTSPOT_COUNT = 5           # Gaussian hotspots in 'clustered' scenarios
+HOTSPOT_SPREAD = 60         # Hotspot standard deviation (meters)
+HOTSPOT_BACKGROUND = 0.2    # Share of users spread uniformly outside hotspots
+
+# --- Result Cache ---
+CACHE_MAX_ENTRIES = 256    # Solver results kept in memory (LRU)
+CACHE_DIR = None           # Set to a folder path to also keep results on disk
+
+# --- Spatial Decomposition ---
+DECOMPOSE_SITES_PER_TILE = 25  # Candidate sites per tile when no tile grid is given
+
 # --- Default Constraints (Can be overridden in GUI) ---
 DEFAULT_N_USERS = 50       # Number of victims (N)
 DEFAULT_BETA = 0.5         # Min coverage percentage (Beta) [cite: 317]
@@ -11,6 +24,18 @@ DEFAULT_UAV_COST = 100     # Cost per drone (c_m)
 DEFAULT_BUDGET = 1000      # Total Budget (C_max) [cite: 323]
 DEFAULT_MAX_DIST = 300     # Max connection range (d_max) [cite: 322]
 
+# --- Anytime Mode for the Optimal Solver ---
+DEFAULT_TIME_BUDGET = 0    # Seconds per solve in the GUI (0 = run to optimality)
+ANYTIME_TIME_LIMIT = 10    # Default wall-clock budget of solve_anytime (seconds)
+ANYTIME_GAP = 0.01         # Stop once the proven relative gap is this small
+
+# --- MILP Solver Backend ---
+SOLVER_BACKEND = 'cbc'     # 'cbc' or 'highs' (see backends.py)
+SOLVER_THREADS = None      # Solver threads (None = the backend's default)
+
+# --- Local Search after the Heuristic ---
+LOCAL_SEARCH_BUDGET_MS = 50  # Wall-clock budget of the improvement stage (milliseconds)
+
 # --- Hard Constraints for Load Balancing ---
 # These prevent over/under-loading drones [cite: 319-320]
 GAMMA_MIN = 2   
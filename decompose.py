@@ -0,0 +1,125 @@
+# decompose.py
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import config
+import utils
+import precompute
+import algorithms
+from online import OnlineDeployment
+from instrument import NULL_STATS
+
+def make_tiles(uav_locs, shape):
+    """
+    Splits the candidate sites into a rows x cols grid of tiles over their
+    bounding box. Returns (tile_of_site, edges): the tile id of every site and
+    the (x_edges, y_edges) tile boundaries.
+    """
+    rows, cols = shape
+    lo = uav_locs.min(axis=0)
+    hi = uav_locs.max(axis=0)
+    x_edges = np.linspace(lo[0], hi[0], cols + 1)
+    y_edges = np.linspace(lo[1], hi[1], rows + 1)
+    return _tile_ids(uav_locs, x_edges, y_edges), (x_edges, y_edges)
+
+def _tile_ids(points, x_edges, y_edges):
+    cols = len(x_edges) - 1
+    rows = len(y_edges) - 1
+    cx = np.clip(np.searchsorted(x_edges, points[:, 0], side='right') - 1, 0, cols - 1)
+    cy = np.clip(np.searchsorted(y_edges, points[:, 1], side='right') - 1, 0, rows - 1)
+    return cy * cols + cx
+
+def default_tile_shape(num_uavs, sites_per_tile=config.DECOMPOSE_SITES_PER_TILE):
+    """
+    Square-ish tile grid with about `sites_per_tile` candidate sites per tile,
+    never less than 2x2 so the problem is always actually split.
+    """
+    side = max(2, int(round(math.sqrt(num_uavs / sites_per_tile))))
+    return side, side
+
+def _solve_tile(job):
+    """Worker entry point: one tile with the named solver, in tile-local indices."""
+    solver = algorithms.SOLVERS[job['algorithm']]
+    active, conns = solver(job['users'], job['uav_locs'], job['inputs'])[:2]
+    return active, conns
+
+def solve_decomposed(users, uav_locs, inputs, candidates=None, tiles=None, algorithm='heuristic',
+                     workers=None, stats=None):
+    """
+    Spatial decomposition for wide areas with many candidate sites.
+    Sites are split into `tiles` (rows, cols) by position. Each tile is solved
+    on its own sites and every user they can reach, so the user side overlaps
+    neighbouring tiles by max_dist. A tile's coverage target is beta times the
+    users located inside it. Tiles run in parallel with `algorithm` (a key of
+    algorithms.SOLVERS) on `workers` processes (1 = in-process).
+    Stitching keeps each boundary user on its nearest claiming site; a repair
+    pass (online.OnlineDeployment.repair) then restores gamma_min, the global
+    budget and the global beta target.
+    Same return contract as solve_optimal.
+    """
+    start_time = time.time()
+    stats = stats or NULL_STATS
+    users = np.asarray(users, dtype=float)
+    uav_locs = np.asarray(uav_locs, dtype=float)
+    if candidates is None:
+        with stats.phase('distances'):
+            candidates = precompute.build_candidate_index(users, uav_locs, inputs['max_dist'])
+    if tiles is None:
+        tiles = default_tile_shape(len(uav_locs))
+
+    # Step 1: Tiles and their sub-problems
+    with stats.phase('partition'):
+        tile_of_site, (x_edges, y_edges) = make_tiles(uav_locs, tiles)
+        home = np.bincount(_tile_ids(users, x_edges, y_edges),
+                           minlength=tiles[0] * tiles[1])
+        jobs = []
+        for t in range(tiles[0] * tiles[1]):
+            sites = np.flatnonzero(tile_of_site == t)
+            if len(sites) == 0:
+                continue
+            reach = [candidates.users_of(m)[0] for m in sites]
+            ids = np.unique(np.concatenate(reach)) if reach else np.zeros(0, dtype=np.int64)
+            if len(ids) == 0:
+                continue
+            target = math.ceil(inputs['beta'] * home[t])
+            tile_inputs = dict(inputs, N=len(ids), beta=min(1.0, target / len(ids)))
+            jobs.append({'sites': sites, 'ids': ids, 'algorithm': algorithm, 'inputs': tile_inputs,
+                         'users': users[ids], 'uav_locs': uav_locs[sites]})
+        stats.count('tiles', len(jobs))
+
+    # Step 2: Independent tile solves
+    with stats.phase('tiles'):
+        if workers == 1 or len(jobs) <= 1:
+            results = [_solve_tile(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_solve_tile, jobs, chunksize=1))
+
+    # Step 3: Stitch; a user claimed by several tiles stays with its nearest site
+    with stats.phase('stitch'):
+        active_indices = []
+        owner = {}
+        claims = 0
+        for job, (active, conns) in zip(jobs, results):
+            active_indices += [int(job['sites'][m]) for m in active]
+            for m, user_list in conns.items():
+                site = int(job['sites'][m])
+                for n in user_list:
+                    n = int(job['ids'][n])
+                    claims += 1
+                    d = utils.calculate_distance(users[n], uav_locs[site])
+                    if n not in owner or d < owner[n][1]:
+                        owner[n] = (site, d)
+        connections_dict = {m: [] for m in active_indices}
+        for n, (m, _) in owner.items():
+            connections_dict[m].append(n)
+        stats.count('boundary_conflicts', claims - len(owner))
+
+    # Step 4: Repair boundary sites, the global budget and the global beta target
+    with stats.phase('repair'):
+        engine = OnlineDeployment(users, uav_locs, inputs, active_indices, connections_dict, candidates)
+        engine.repair()
+        active_indices, connections_dict, utility = engine.solution()
+
+    return active_indices, connections_dict, utility, time.time() - start_time
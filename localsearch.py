@@ -0,0 +1,263 @@
+# localsearch.py
+import time
+import config
+
+class LocalSearch:
+    """
+    Improvement stage for a feasible deployment (e.g. from solve_heuristic).
+    Applies only moves that lower the raw weighted utility of
+    utils.calculate_weighted_utility, keeping gamma_min/gamma_max, the budget
+    and the coverage target. Moves are scored by their change to the utility
+    terms (open sites, connections, total distance), never by a full
+    re-evaluation:
+    - drop: remove a surplus link once coverage is above target
+    - reassign: move a user to a closer open site, or replace a far user
+      with a closer free one
+    - close: shut a site and rehome (or drop, if surplus allows) its users
+    - swap: close one site and open a closed one nearby
+    - open: open a site when the distance it saves outweighs its cost
+    """
+
+    def __init__(self, inputs, num_uavs, candidates, active_indices, connections_dict, target_users):
+        N = inputs['N']
+        self.g_min = inputs['gamma_min']
+        self.g_max = inputs['gamma_max']
+        self.max_sites = int(inputs['budget'] // inputs['uav_cost']) if inputs['uav_cost'] > 0 else num_uavs
+
+        # Raw utility = w_site * sites + w_conn * connections + w_dist * total distance
+        cost_share = inputs['uav_cost'] / inputs['budget'] if inputs['budget'] > 0 else 0
+        self.w_site = config.ALPHA * (1 + cost_share) / num_uavs
+        self.w_conn = config.ALPHA / N if N > 0 else 0
+        self.w_dist = config.ALPHA / (N * inputs['max_dist']) if N > 0 else 0
+
+        self.reach = {}
+        for m in range(num_uavs):
+            idx, dist = candidates.users_of(m)
+            if len(idx) >= max(self.g_min, 1):
+                self.reach[m] = dict(zip(idx.tolist(), dist.tolist()))
+        by_user = candidates.transpose()
+        self.sites_of = lambda n: by_user.users_of(n)[0].tolist()
+
+        self.members = {m: set() for m in active_indices}
+        self.assign = {}
+        for m, user_list in connections_dict.items():
+            for n in user_list:
+                self.members[m].add(n)
+                self.assign[n] = m
+        self.floor = min(target_users, len(self.assign))
+        self.moves = 0
+
+    def run(self, budget_ms):
+        """Improves until no move helps or `budget_ms` milliseconds have passed."""
+        self.deadline = time.perf_counter() + budget_ms / 1000.0
+        improved = True
+        while improved and not self._expired():
+            improved = False
+            for step in (self._drop_surplus, self._reassign, self._close_sites, self._swap_sites, self._open_sites):
+                if self._expired():
+                    break
+                improved |= step()
+
+    def _expired(self):
+        return time.perf_counter() > self.deadline
+
+    def total_dist(self):
+        return sum(self.reach[m][n] for n, m in self.assign.items())
+
+    def solution(self):
+        """(active_indices, connections_dict, connection count, total distance)."""
+        active_indices = sorted(self.members)
+        connections_dict = {m: sorted(self.members[m]) for m in active_indices}
+        return active_indices, connections_dict, len(self.assign), self.total_dist()
+
+    # --- Moves ---
+
+    def _drop_surplus(self):
+        """Farthest links first, from sites above gamma_min."""
+        surplus = len(self.assign) - self.floor
+        if surplus <= 0:
+            return False
+        links = sorted(((self.reach[m][n], n, m) for n, m in self.assign.items()), reverse=True)
+        dropped = 0
+        for d, n, m in links:
+            if dropped >= surplus or self._expired():
+                break
+            if len(self.members[m]) > self.g_min:
+                self._unlink(n)
+                dropped += 1
+        self.moves += dropped
+        return dropped > 0
+
+    def _reassign(self):
+        improved = False
+        for n, a in list(self.assign.items()):
+            if self._expired():
+                break
+            if len(self.members[a]) <= self.g_min:
+                continue
+            d_old = self.reach[a][n]
+            best, best_d = None, d_old
+            for b in self.sites_of(n):
+                if b != a and b in self.members and len(self.members[b]) < self.g_max and self.reach[b][n] < best_d:
+                    best, best_d = b, self.reach[b][n]
+            if best is not None:
+                self._unlink(n)
+                self._link(n, best)
+                self.moves += 1
+                improved = True
+
+        # Same site, closer user: swap a covered user for a free one
+        for m, users in self.members.items():
+            if self._expired():
+                break
+            free = sorted((d, n) for n, d in self.reach[m].items() if n not in self.assign)
+            far = sorted(((self.reach[m][n], n) for n in users), reverse=True)
+            for (d_free, n_free), (d_far, n_far) in zip(free, far):
+                if d_free >= d_far:
+                    break
+                self._unlink(n_far)
+                self._link(n_free, m)
+                self.moves += 1
+                improved = True
+        return improved
+
+    def _close_sites(self):
+        improved = False
+        for m in sorted(self.members, key=lambda m: len(self.members[m])):
+            if self._expired():
+                break
+            if m not in self.members:
+                continue
+            plan, delta = self._plan_removal(m, {})
+            delta -= self.w_site
+            if plan is not None and delta < 0:
+                self._apply_removal(m, plan)
+                self.moves += 1
+                improved = True
+        return improved
+
+    def _swap_sites(self):
+        improved = False
+        for a in sorted(self.members, key=lambda m: len(self.members[m])):
+            if self._expired():
+                break
+            if a not in self.members:
+                continue
+            # Closed sites that can take over at least one of a's users
+            options = {b for n in self.members[a] for b in self.sites_of(n)
+                       if b != a and b not in self.members and b in self.reach}
+            best = None
+            for b in options:
+                taken = self._fill_plan(b, self.members[a])
+                if taken is None:
+                    continue
+                plan, delta = self._plan_removal(a, taken)
+                if plan is None:
+                    continue
+                delta += sum(self.w_dist * d + (0 if n in self.members[a] else self.w_conn)
+                             for n, d in taken.items())
+                if delta < 0 and (best is None or delta < best[0]):
+                    best = (delta, b, taken, plan)
+            if best is not None:
+                _, b, taken, plan = best
+                self._apply_removal(a, plan)
+                self.members[b] = set()
+                for n in taken:
+                    self._link(n, b)
+                self.moves += 1
+                improved = True
+        return improved
+
+    def _open_sites(self):
+        if len(self.members) >= self.max_sites:
+            return False
+        improved = False
+        for b in self.reach:
+            if self._expired() or len(self.members) >= self.max_sites:
+                break
+            if b in self.members:
+                continue
+            # Users that would be closer to b, taken from donors above gamma_min
+            gains = sorted((self.reach[b][n] - self.reach[self.assign[n]][n], n)
+                           for n in self.reach[b] if n in self.assign)
+            spare = {m: len(users) - self.g_min for m, users in self.members.items()}
+            taken, delta = [], self.w_site
+            for saving, n in gains:
+                if saving >= 0 or len(taken) >= self.g_max:
+                    break
+                if spare[self.assign[n]] > 0:
+                    spare[self.assign[n]] -= 1
+                    taken.append(n)
+                    delta += self.w_dist * saving
+            if len(taken) >= max(self.g_min, 1) and delta < 0:
+                self.members[b] = set()
+                for n in taken:
+                    self._unlink(n)
+                    self._link(n, b)
+                self.moves += 1
+                improved = True
+        return improved
+
+    # --- Move helpers ---
+
+    def _fill_plan(self, b, preferred):
+        """
+        Users a newly opened site b would take: nearest of `preferred` first,
+        then nearest free users, up to gamma_max. None if under gamma_min.
+        """
+        ranked = sorted((d, n not in preferred, n) for n, d in self.reach[b].items()
+                        if n in preferred or n not in self.assign)
+        taken = {}
+        for d, _, n in ranked:
+            if len(taken) >= self.g_max:
+                break
+            taken[n] = d
+        return taken if len(taken) >= max(self.g_min, 1) else None
+
+    def _plan_removal(self, m, keep):
+        """
+        Rehoming plan for closing site m: {user: new site or None (dropped)}
+        and the change in utility, excluding the site term. Users in `keep`
+        are already covered elsewhere. Plan is None if coverage would fall
+        below the floor.
+        """
+        room = {s: self.g_max - len(users) for s, users in self.members.items() if s != m}
+        plan = {}
+        delta = 0.0
+        covered = len(self.assign) + sum(1 for n in keep if n not in self.assign)
+        for n in self.members[m]:
+            if n in keep:
+                plan[n] = None
+                delta -= self.w_dist * self.reach[m][n]
+                continue
+            best, best_d = None, None
+            for s in self.sites_of(n):
+                if room.get(s, 0) > 0 and (best_d is None or self.reach[s][n] < best_d):
+                    best, best_d = s, self.reach[s][n]
+            if best is None:
+                covered -= 1
+                plan[n] = None
+                delta -= self.w_conn + self.w_dist * self.reach[m][n]
+            else:
+                room[best] -= 1
+                plan[n] = best
+                delta += self.w_dist * (best_d - self.reach[m][n])
+        if covered < self.floor:
+            return None, 0.0
+        return plan, delta
+
+    def _apply_removal(self, m, plan):
+        for n in list(self.members[m]):
+            self._unlink(n)
+        del self.members[m]
+        for n, s in plan.items():
+            if s is not None:
+                self._link(n, s)
+
+    def _link(self, n, m):
+        self.assign[n] = m
+        self.members[m].add(n)
+
+    def _unlink(self, n):
+        m = self.assign.pop(n)
+        self.members[m].discard(n)
@@ -1,16 +1,20 @@
 # main.py
 import tkinter as tk
 from tkinter import ttk, messagebox
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.ticker import MaxNLocator # <--- NEW: For integer axis ticks
 import numpy as np
+import os
 import sys
+import multiprocessing
 import config
 import utils
-import algorithms
+import worker
+import cache
+from solution import Solution
 
 class DisasterApp(tk.Tk):
+    POLL_MS = 100  # How often the GUI checks the solver worker for results
+    PLOT_WARMUP_MS = 200  # Matplotlib is loaded this long after the window first appears
+
     def __init__(self):
         super().__init__()
         self.title("UAV Deployment: Multi-Criterion Optimization Framework")
@@ -27,8 +31,13 @@ class DisasterApp(tk.Tk):
         self.bind("<Escape>", self.on_close)
 
         # 3. DATA STORAGE
-        self.map_data_history = {} 
         self.available_betas = [0.2, 0.3, 0.4, 0.5, 0.6] 
+        self.done_betas = []
+        self.beta_results = {}
+        self.worker = None
+        self.users = None
+        self.scenario_spec = None
+        self.result_cache = cache.ResultCache(directory=config.CACHE_DIR)
         
         # --- Layout ---
         self.left_panel = ttk.Frame(self, padding=10, width=350)
@@ -63,11 +72,15 @@ class DisasterApp(tk.Tk):
 
         self.setup_controls()
         self.setup_map_tab()
-        self.setup_chart_pages()
+
+        # Plotting is slow to import; build the figures once the window is up
+        self.plots_ready = False
+        self.after(self.PLOT_WARMUP_MS, self.ensure_plots)
 
     def on_close(self, event=None):
         """Safe shutdown sequence."""
         self.app_running = False
+        self.cancel_simulation()
         self.destroy() 
         sys.exit(0)    
 
@@ -81,7 +94,12 @@ class DisasterApp(tk.Tk):
         
         ttk.Label(self.left_panel, text="Grid Size:", font=lbl_font).pack(anchor="w")
         self.var_grid = tk.StringVar(value="4x4")
-        ttk.Combobox(self.left_panel, textvariable=self.var_grid, values=["3x3", "4x4", "5x5"], 
+        ttk.Combobox(self.left_panel, textvariable=self.var_grid, values=["3x3", "4x4", "5x5", "7x7", "10x10", "20x20"], 
+                     font=("Arial", 10)).pack(fill=tk.X, ipady=3)
+
+        ttk.Label(self.left_panel, text="Victim Distribution:", font=lbl_font).pack(anchor="w", pady=(10,0))
+        self.var_distribution = tk.StringVar(value="uniform")
+        ttk.Combobox(self.left_panel, textvariable=self.var_distribution, values=["uniform", "clustered"], 
                      state="readonly", font=("Arial", 10)).pack(fill=tk.X, ipady=3)
         
         ttk.Label(self.left_panel, text="Number of Users (N):", font=lbl_font).pack(anchor="w", pady=(10,0))
@@ -121,8 +139,20 @@ class DisasterApp(tk.Tk):
         self.var_dist = tk.IntVar(value=config.DEFAULT_MAX_DIST)
         ttk.Entry(self.left_panel, textvariable=self.var_dist).pack(fill=tk.X, ipady=3)
 
+        ttk.Label(self.left_panel, text="Optimal Time Budget (s, 0 = none):", font=lbl_font).pack(anchor="w", pady=(10,0))
+        self.var_time_budget = tk.DoubleVar(value=config.DEFAULT_TIME_BUDGET)
+        ttk.Entry(self.left_panel, textvariable=self.var_time_budget).pack(fill=tk.X, ipady=3)
+
+        self.var_reuse = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.left_panel, text="Reuse Last Scenario", variable=self.var_reuse).pack(anchor="w", pady=(15,0))
+        self.var_use_cache = tk.BooleanVar(value=True)
+        ttk.Checkbutton(self.left_panel, text="Use Cached Results (off for timing)", variable=self.var_use_cache).pack(anchor="w")
+
         # RUN BUTTON
-        ttk.Button(self.left_panel, text="RUN BATCH SIMULATION", command=self.run_batch_simulation).pack(pady=30, fill=tk.X, ipady=10)
+        ttk.Button(self.left_panel, text="RUN BATCH SIMULATION", command=self.run_batch_simulation).pack(pady=(30,5), fill=tk.X, ipady=10)
+        ttk.Button(self.left_panel, text="CANCEL", command=self.cancel_simulation).pack(fill=tk.X, ipady=3)
+        self.lbl_status = ttk.Label(self.left_panel, text="Idle", foreground="gray")
+        self.lbl_status.pack(pady=(5,0))
 
         # EXIT BUTTON
         btn_exit = tk.Button(self.left_panel, text="EXIT APP", bg="#ffcccc", fg="red", font=("Arial", 10, "bold"), command=self.on_close)
@@ -142,13 +172,33 @@ class DisasterApp(tk.Tk):
         
         self.lbl_cur_beta = ttk.Label(self.map_ctrl_frame, text="Beta: 0.2", font=("Arial", 12))
         self.lbl_cur_beta.pack(side=tk.LEFT, padx=10)
-        
+        self.map_shown = None
+
+    def ensure_plots(self):
+        """Imports matplotlib and builds every figure, on first call only."""
+        if self.plots_ready or not self.app_running:
+            return
+        self.setup_map_figure()
+        self.setup_chart_pages()
+        self.plots_ready = True
+
+    def setup_map_figure(self):
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
         self.fig_map, (self.ax_opt, self.ax_heu) = plt.subplots(1, 2, figsize=(10, 5))
         self.canvas_map = FigureCanvasTkAgg(self.fig_map, master=self.tab_map)
         self.canvas_map.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
+        # Persistent artists per map panel; only their data changes between betas
+        self.map_artists = {ax: self.create_map_artists(ax) for ax in (self.ax_opt, self.ax_heu)}
+        self.map_scenario = {}
+
     def setup_chart_pages(self):
         """Creates a dedicated Figure for each chart page."""
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
         self.fig_c1, self.ax_c1 = plt.subplots()
         self.cvs_c1 = FigureCanvasTkAgg(self.fig_c1, master=self.page_conns)
         self.cvs_c1.get_tk_widget().pack(fill=tk.BOTH, expand=True)
@@ -161,12 +211,15 @@ class DisasterApp(tk.Tk):
         self.cvs_c3 = FigureCanvasTkAgg(self.fig_c3, master=self.page_util)
         self.cvs_c3.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
-        self.fig_c4, self.ax_c4 = plt.subplots()
+        self.fig_c4, (self.ax_c4, self.ax_c4_phases) = plt.subplots(2, 1, gridspec_kw={'height_ratios': [3, 2]})
         self.cvs_c4 = FigureCanvasTkAgg(self.fig_c4, master=self.page_time)
         self.cvs_c4.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
     def run_batch_simulation(self):
-        """Runs the algorithms 5 times."""
+        """Runs the algorithms 5 times in a background worker."""
+        if self.worker is not None and self.worker.is_alive():
+            messagebox.showinfo("Busy", "A simulation is already running.")
+            return
         try:
             base_inputs = {
                 'N': self.var_users.get(),
@@ -176,84 +229,147 @@ class DisasterApp(tk.Tk):
                 'gamma_min': self.var_gmin.get(),
                 'gamma_max': self.var_gmax.get()
             }
+            time_budget = self.var_time_budget.get()
+            grid_type = self.var_grid.get()
+            utils.parse_grid(grid_type)
         except Exception:
-            messagebox.showerror("Input Error", "Please ensure all fields are integers.")
+            messagebox.showerror("Input Error", "Please ensure all fields are integers and the grid is RxC.")
             return
 
-        grid_type = self.var_grid.get()
-        users, uavs = utils.generate_scenario(base_inputs['N'], grid_type)
+        # Same users/sites as last time if asked (and still compatible)
+        spec = (base_inputs['N'], grid_type, self.var_distribution.get())
+        if not (self.var_reuse.get() and self.users is not None and spec == self.scenario_spec):
+            self.users, self.uavs = utils.generate_scenario(*spec)
+            self.scenario_spec = spec
         
         self.available_betas = [0.2, 0.3, 0.4, 0.5, 0.6]
-        self.map_data_history.clear()
-        
-        res_opt = {'conns': [], 'uavs': [], 'util': [], 'time': []}
-        res_heu = {'conns': [], 'uavs': [], 'util': [], 'time': []}
+        self.done_betas = []
+        self.beta_results = {}
         
         print(f"Starting Batch Simulation... (Max Load: {base_inputs['gamma_max']})")
-        
+
+        # Betas solved before with identical inputs come straight from the cache
+        self.cache_keys = {}
+        missing = []
         for b in self.available_betas:
-            if not self.app_running: return 
-            self.update()
-            
-            print(f"  Running Beta={b}...")
-            current_inputs = base_inputs.copy()
-            current_inputs['beta'] = b
-            
-            # Run Optimal
-            opt_full = algorithms.solve_optimal(users, uavs, current_inputs)
-            res_opt['conns'].append(sum(len(v) for v in opt_full[1].values()))
-            res_opt['uavs'].append(len(opt_full[0]))
-            res_opt['util'].append(opt_full[2])
-            res_opt['time'].append(opt_full[3])
-
-            # Run Heuristic
-            heu_full = algorithms.solve_heuristic(users, uavs, current_inputs)
-            res_heu['conns'].append(sum(len(v) for v in heu_full[1].values()))
-            res_heu['uavs'].append(len(heu_full[0]))
-            res_heu['util'].append(heu_full[2])
-            res_heu['time'].append(heu_full[3])
-            
-            self.map_data_history[b] = {
-                'users': users,
-                'uavs': uavs,
-                'opt': opt_full,
-                'heu': heu_full
-            }
+            inputs = dict(base_inputs, beta=b)
+            self.cache_keys[b] = cache.result_key(self.users, self.uavs, inputs, 'gui_sweep',
+                                                  {'time_budget': time_budget, 'gap': config.ANYTIME_GAP})
+            cached = self.result_cache.get(self.cache_keys[b]) if self.var_use_cache.get() else None
+            if cached is not None:
+                self.add_beta_result(b, *cached)
+            else:
+                missing.append(b)
+
+        if not missing:
+            self.lbl_status.config(text="Complete (cached)")
+            messagebox.showinfo("Done", "Batch Simulation Complete.")
+            return
+
+        # Solves run in a child process; results come back through a queue
+        self.worker = worker.SweepWorker(self.users, self.uavs, base_inputs, missing, time_budget)
+        self.worker.start()
+        self.lbl_status.config(text="Starting...")
+        self.after(self.POLL_MS, self.poll_worker)
+
+    def cancel_simulation(self):
+        """Stops the running sweep, including a CBC solve in progress."""
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+            self.lbl_status.config(text="Cancelled")
+
+    def poll_worker(self):
+        """Drains worker messages and fills charts and map in as betas finish."""
+        if not self.app_running or self.worker is None:
+            return
 
-        if not self.app_running: return
+        for msg in self.worker.poll():
+            kind = msg[0]
+            if kind == 'progress':
+                self.lbl_status.config(text=f"Solving Beta={msg[1]}...")
+            elif kind == 'result':
+                self.result_cache.put(self.cache_keys[msg[1]], msg[2:])
+                self.add_beta_result(*msg[1:])
+            elif kind == 'error':
+                self.worker = None
+                self.lbl_status.config(text="Failed")
+                messagebox.showerror("Solver Error", msg[1])
+                return
+            elif kind == 'done':
+                self.worker = None
+                self.lbl_status.config(text="Complete")
+                messagebox.showinfo("Done", "Batch Simulation Complete.")
+                return
+
+        if not self.worker.is_alive():
+            # Died without reporting (e.g. killed by the OS)
+            self.worker = None
+            self.lbl_status.config(text="Failed")
+            return
+        self.after(self.POLL_MS, self.poll_worker)
+
+    def add_beta_result(self, b, opt_full, heu_full, opt_stats, heu_stats):
+        self.ensure_plots()
+        # Compact per-beta results; all of them share the scenario arrays
+        opt = Solution.from_result(self.users, self.uavs, opt_full)
+        heu = Solution.from_result(self.users, self.uavs, heu_full)
+        self.beta_results[b] = (opt, heu, opt_stats, heu_stats)
+        self.map_shown = None
+        
+        # Cached and freshly solved betas can arrive out of order
+        self.done_betas = sorted(self.beta_results)
+        betas = self.done_betas
+
+        res_opt = {'conns': [], 'uavs': [], 'util': [], 'time': [], 'phases': []}
+        res_heu = {'conns': [], 'uavs': [], 'util': [], 'time': [], 'phases': []}
+        for beta in betas:
+            opt, heu, o_stats, h_stats = self.beta_results[beta]
+            for res, sol, stats in ((res_opt, opt, o_stats), (res_heu, heu, h_stats)):
+                res['conns'].append(sol.conn_count)
+                res['uavs'].append(sol.num_active)
+                res['util'].append(sol.utility)
+                res['time'].append(sol.runtime)
+                res['phases'].append(stats['phases'])
 
         # Plot Charts
         # --- INTEGER TICK UPDATE: Added integer_ticks=True for Counts and Utility ---
-        self.plot_bar_chart(self.ax_c1, self.cvs_c1, self.available_betas, res_opt['conns'], res_heu['conns'], 
+        self.plot_bar_chart(self.ax_c1, self.cvs_c1, betas, res_opt['conns'], res_heu['conns'], 
                             "Total Connections", "Count", integer_ticks=True)
                             
-        self.plot_bar_chart(self.ax_c2, self.cvs_c2, self.available_betas, res_opt['uavs'], res_heu['uavs'], 
+        self.plot_bar_chart(self.ax_c2, self.cvs_c2, betas, res_opt['uavs'], res_heu['uavs'], 
                             "Installed UAVs", "Count", integer_ticks=True)
                             
-        self.plot_bar_chart(self.ax_c3, self.cvs_c3, self.available_betas, res_opt['util'], res_heu['util'], 
+        self.plot_bar_chart(self.ax_c3, self.cvs_c3, betas, res_opt['util'], res_heu['util'], 
                             "Weighted Utility", "Score", integer_ticks=True)
                             
-        self.plot_bar_chart(self.ax_c4, self.cvs_c4, self.available_betas, res_opt['time'], res_heu['time'], 
+        self.plot_bar_chart(self.ax_c4, self.cvs_c4, betas, res_opt['time'], res_heu['time'], 
                             "Runtime", "Seconds", log_scale=True)
+        self.plot_phase_chart(self.ax_c4_phases, self.cvs_c4, betas, res_opt['phases'], "Optimal Runtime by Phase")
         
-        self.scale_beta.set(0) 
-        self.update_map_view(0)
-        
-        messagebox.showinfo("Done", "Batch Simulation Complete.")
+        if len(betas) == 1:
+            self.scale_beta.set(0) 
+        self.update_map_view(self.scale_beta.get())
 
     def update_map_view(self, val):
-        if not self.map_data_history:
+        if not self.beta_results:
             return
         idx = int(float(val))
-        if idx >= len(self.available_betas): idx = len(self.available_betas) - 1
-        beta = self.available_betas[idx]
+        if idx >= len(self.done_betas): idx = len(self.done_betas) - 1
+        beta = self.done_betas[idx]
+        # The slider fires on every pixel; only redraw when the beta changes
+        if beta == self.map_shown:
+            return
+        self.map_shown = beta
         self.lbl_cur_beta.config(text=f"Beta: {beta}")
-        data = self.map_data_history[beta]
-        self.plot_map(self.ax_opt, f"Optimal (Beta={beta})", data['users'], data['uavs'], data['opt'][0], data['opt'][1])
-        self.plot_map(self.ax_heu, f"Proposed (Beta={beta})", data['users'], data['uavs'], data['heu'][0], data['heu'][1])
-        self.canvas_map.draw()
+        opt, heu = self.beta_results[beta][:2]
+        self.plot_map(self.ax_opt, f"Optimal (Beta={beta})", opt)
+        self.plot_map(self.ax_heu, f"Proposed (Beta={beta})", heu)
+        self.canvas_map.draw_idle()
 
     def plot_bar_chart(self, ax, canvas, x_vals, y_opt, y_heu, title, ylabel, log_scale=False, integer_ticks=False):
+        from matplotlib.ticker import MaxNLocator
+
         ax.clear()
         x = np.arange(len(x_vals))
         
@@ -278,30 +394,82 @@ class DisasterApp(tk.Tk):
             
         canvas.draw()
 
-    def plot_map(self, ax, title, users, uavs, active_idx, conns_dict):
+    def plot_phase_chart(self, ax, canvas, x_vals, phase_dicts, title):
+        """Stacked bars of per-phase solver time for each beta."""
         ax.clear()
-        ax.set_title(title)
+        x = np.arange(len(x_vals))
+        names = []
+        for phases in phase_dicts:
+            names += [k for k in phases if k not in names]
         
+        bottom = np.zeros(len(x_vals))
+        for name in names:
+            vals = np.array([phases.get(name, 0.0) for phases in phase_dicts])
+            ax.bar(x, vals, width=0.6, bottom=bottom, label=name, align='center')
+            bottom += vals
+        
+        ax.set_ylabel('Seconds', fontsize=12)
+        ax.set_xlabel('Beta', fontsize=12)
+        ax.set_title(title, fontsize=14, fontweight='bold')
+        ax.set_xticks(x)
+        ax.set_xticklabels(x_vals)
+        if names:
+            ax.legend(fontsize=9, loc='upper right', ncol=2)
+        ax.grid(axis='y', linestyle='--', alpha=0.3)
+        canvas.draw()
+
+    def create_map_artists(self, ax):
+        """Builds the map panel once: axes, empty scatters, one LineCollection for all links."""
+        from matplotlib.collections import LineCollection
+
         buffer = 50 
         ax.set_xlim(-buffer, config.GRID_WIDTH + buffer)
         ax.set_ylim(-buffer, config.GRID_HEIGHT + buffer)
         ax.set_aspect('equal', adjustable='box')
         ax.grid(True, linestyle='--', alpha=0.3)
-        
-        ax.scatter(users[:,0], users[:,1], c='blue', s=20, alpha=0.6, label='Users')
-        ax.scatter(uavs[:,0], uavs[:,1], c='lightgray', marker='s', s=60, label='Potential UAV')
-        
-        if active_idx:
-            active_coords = uavs[active_idx]
-            ax.scatter(active_coords[:,0], active_coords[:,1], c='red', marker='s', s=120, label='Active UAV', zorder=5)
-            for m_idx, user_indices in conns_dict.items():
-                start = uavs[m_idx]
-                for u_idx in user_indices:
-                    end = users[u_idx]
-                    ax.plot([start[0], end[0]], [start[1], end[1]], 'r-', linewidth=1.0, alpha=0.4, zorder=1)
-        
+
+        empty = np.empty((0, 2))
+        artists = {
+            'links': LineCollection([], colors='r', linewidths=1.0, alpha=0.4, zorder=1),
+            'users': ax.scatter(empty[:,0], empty[:,1], c='blue', s=20, alpha=0.6, label='Users'),
+            'uavs': ax.scatter(empty[:,0], empty[:,1], c='lightgray', marker='s', s=60, label='Potential UAV'),
+            'active': ax.scatter(empty[:,0], empty[:,1], c='red', marker='s', s=120, label='Active UAV', zorder=5),
+        }
+        ax.add_collection(artists['links'])
         ax.legend(loc='upper right', fontsize=9)
+        return artists
+
+    def plot_map(self, ax, title, sol):
+        """Updates the panel's persistent artists in place from a Solution."""
+        artists = self.map_artists[ax]
+        ax.set_title(title)
+        users, uavs = sol.users, sol.uav_locs
+
+        # Users and candidate sites only change with the scenario
+        shown = self.map_scenario.get(ax)
+        if shown is None or shown[0] is not users or shown[1] is not uavs:
+            artists['users'].set_offsets(users)
+            artists['uavs'].set_offsets(uavs)
+            self.map_scenario[ax] = (users, uavs)
+
+        artists['active'].set_offsets(uavs[sol.active])
+
+        # All links as one (K, 2, 2) segment array
+        artists['links'].set_segments(sol.segments())
+
+def probe_startup(app, stage):
+    """For benchmark.py startup: quit as soon as `stage` ('window' or 'plots') is on screen."""
+    app.update()
+    if stage == 'plots':
+        app.ensure_plots()
+        app.update()
+    app.on_close()
 
 if __name__ == "__main__":
+    # Needed for the solver worker process in the frozen executable
+    multiprocessing.freeze_support()
     app = DisasterApp()
+    stage = os.environ.get("UAV_SIM_STARTUP_PROBE")
+    if stage:
+        probe_startup(app, stage)
     app.mainloop()
\ No newline at end of file
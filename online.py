@@ -0,0 +1,342 @@
+# online.py
+import argparse
+import time
+import numpy as np
+import config
+import utils
+import algorithms
+
+class OnlineDeployment:
+    """
+    Incremental deployment engine for victims that appear, leave or move.
+    Seeded from an existing (active_indices, connections_dict) solution, it
+    repairs the assignment locally after each event: users are reassigned
+    within gamma_max, and sites are opened or closed only when coverage or
+    gamma_min would otherwise be violated.
+    User ids are stable: the initial users are 0..N-1, added users get new ids.
+    `candidates` (precompute.CandidateIndex) saves recomputing the initial reach.
+    """
+
+    def __init__(self, users, uav_locs, inputs, active_indices, connections_dict, candidates=None):
+        self.uav_locs = np.asarray(uav_locs, dtype=float)
+        self.inputs = dict(inputs)
+        self.g_min = inputs['gamma_min']
+        self.g_max = inputs['gamma_max']
+        self.max_sites = int(inputs['budget'] // inputs['uav_cost']) if inputs['uav_cost'] > 0 else len(self.uav_locs)
+
+        self.pos = {}
+        self.reach = {}                                   # user -> [(dist, site)] nearest first
+        self.site_reach = {m: set() for m in range(len(self.uav_locs))}
+        self.assign = {}                                  # user -> (site, dist)
+        self.members = {}                                 # active site -> set of users
+        self.total_dist = 0.0
+        self.next_id = 0
+        self.latencies_ms = []
+
+        by_user = candidates.transpose() if candidates is not None else None
+        for n, p in enumerate(np.asarray(users, dtype=float)):
+            self._add_user(p, by_user.users_of(n) if by_user is not None else None)
+        for m in active_indices:
+            self.members[m] = set()
+        for m, user_list in connections_dict.items():
+            for n in user_list:
+                self._link(n, m)
+
+    # --- Events ---
+
+    def apply(self, event):
+        """
+        Applies ('add', x, y), ('remove', id) or ('move', id, x, y); returns latency in ms.
+        Raises ValueError, before changing anything, for an id that is not a
+        live user or a position that is not two finite numbers.
+        """
+        start = time.perf_counter()
+        kind = event[0]
+        if kind == 'add':
+            self._add_user(_position(event[1:3]))
+        elif kind == 'remove':
+            self._remove_user(self._live_user(event))
+        elif kind == 'move':
+            u = self._live_user(event)
+            self._move_user(u, _position(event[2:4]))
+        else:
+            raise ValueError(f"Unknown event: {kind}")
+        self._restore_coverage()
+        latency = (time.perf_counter() - start) * 1000
+        self.latencies_ms.append(latency)
+        return latency
+
+    def _live_user(self, event):
+        """The user id an event refers to; never-added and removed ids are rejected."""
+        u = event[1] if len(event) > 1 else None
+        try:
+            live = u in self.pos
+        except TypeError:
+            live = False
+        if not live:
+            raise ValueError(f"Event refers to no live user: {tuple(event)}")
+        return u
+
+    def _add_user(self, p, reach=None):
+        u = self.next_id
+        self.next_id += 1
+        self.pos[u] = np.asarray(p, dtype=float)
+        self._update_reach(u, reach)
+        return u
+
+    def _remove_user(self, u):
+        site = self._unlink(u)
+        for _, m in self.reach.pop(u):
+            self.site_reach[m].discard(u)
+        del self.pos[u]
+        if site is not None:
+            self._fix_site(site)
+
+    def _move_user(self, u, p):
+        self.pos[u] = np.asarray(p, dtype=float)
+        self._update_reach(u)
+        if u in self.assign:
+            site = self.assign[u][0]
+            new_dist = next((d for d, m in self.reach[u] if m == site), None)
+            if new_dist is None:
+                # Out of range of its UAV now
+                self._unlink(u)
+                self._fix_site(site)
+            else:
+                self.total_dist += new_dist - self.assign[u][1]
+                self.assign[u] = (site, new_dist)
+
+    # --- Local repair ---
+
+    def repair(self):
+        """
+        Makes a seeded solution feasible again: sites under gamma_min are
+        refilled or closed, the least loaded sites are closed while over
+        budget, and coverage is restored to beta.
+        """
+        for m in list(self.members):
+            self._fix_site(m)
+        while len(self.members) > self.max_sites:
+            self._close_site(min(self.members, key=lambda m: len(self.members[m])))
+        self._restore_coverage()
+
+    def _target(self):
+        return int(np.ceil(self.inputs['beta'] * len(self.pos)))
+
+    def _restore_coverage(self):
+        """Fills spare capacity first, then opens sites, until beta is met again."""
+        while len(self.assign) < self._target():
+            if not self._fill_spare_capacity(self._target() - len(self.assign)) and not self._open_site():
+                break
+
+    def _fill_spare_capacity(self, needed):
+        """Links up to `needed` free users to open sites with room; True if any were linked."""
+        options = []
+        for m, users in self.members.items():
+            if len(users) < self.g_max:
+                for u in self.site_reach[m]:
+                    if u not in self.assign:
+                        options.append((self._dist(u, m), u, m))
+        options.sort()
+        linked = 0
+        for d, u, m in options:
+            if linked >= needed:
+                break
+            if u not in self.assign and len(self.members[m]) < self.g_max:
+                self._link(u, m, d)
+                linked += 1
+        return linked > 0
+
+    def _open_site(self):
+        """Opens the closed site that can take the most free users; True on success."""
+        if len(self.members) >= self.max_sites:
+            return False
+        best, best_free = None, []
+        for m, users in self.site_reach.items():
+            if m in self.members:
+                continue
+            free = [u for u in users if u not in self.assign]
+            if len(free) >= max(self.g_min, 1) and min(len(free), self.g_max) > min(len(best_free), self.g_max):
+                best, best_free = m, free
+        if best is None:
+            return False
+        self.members[best] = set()
+        for u in sorted(best_free, key=lambda u: self._dist(u, best))[:self.g_max]:
+            self._link(u, best)
+        return True
+
+    def _fix_site(self, m):
+        """Keeps site m at or above gamma_min, or closes it and rehomes its users."""
+        users = self.members[m]
+        floor = max(self.g_min, 1)
+        if len(users) >= floor:
+            return
+        free = sorted((u for u in self.site_reach[m] if u not in self.assign), key=lambda u: self._dist(u, m))
+        for u in free[:floor - len(users)]:
+            self._link(u, m)
+        if len(users) >= floor:
+            return
+        self._close_site(m)
+
+    def _close_site(self, m):
+        """Closes site m, moving its users to other open sites with room; the rest become free."""
+        orphans = list(self.members[m])
+        for u in orphans:
+            self._unlink(u)
+        del self.members[m]
+        for u in orphans:
+            for d, other in self.reach[u]:
+                if other in self.members and len(self.members[other]) < self.g_max:
+                    self._link(u, other, d)
+                    break
+
+    # --- Bookkeeping ---
+
+    def _update_reach(self, u, reach=None):
+        """Recomputes the sites within max_dist of u, or takes them as (site_ids, dists)."""
+        for _, m in self.reach.get(u, []):
+            self.site_reach[m].discard(u)
+        if reach is None:
+            d = np.sqrt(((self.uav_locs - self.pos[u]) ** 2).sum(axis=1))
+            sites = np.flatnonzero(d <= self.inputs['max_dist'])
+            reach = (sites, d[sites])
+        self.reach[u] = sorted(zip(np.asarray(reach[1], dtype=float).tolist(), np.asarray(reach[0]).tolist()))
+        for _, m in self.reach[u]:
+            self.site_reach[m].add(u)
+
+    def _dist(self, u, m):
+        return float(np.sqrt(((self.uav_locs[m] - self.pos[u]) ** 2).sum()))
+
+    def _link(self, u, m, d=None):
+        d = self._dist(u, m) if d is None else d
+        self.assign[u] = (m, d)
+        self.members[m].add(u)
+        self.total_dist += d
+
+    def _unlink(self, u):
+        if u not in self.assign:
+            return None
+        m, d = self.assign.pop(u)
+        self.members[m].discard(u)
+        self.total_dist -= d
+        return m
+
+    # --- Views ---
+
+    def current_users(self):
+        """(users array, ids) with row k of the array holding user ids[k]."""
+        ids = sorted(self.pos)
+        users = np.array([self.pos[u] for u in ids]).reshape(-1, 2)
+        return users, ids
+
+    def solution(self):
+        """(active_indices, connections_dict with user ids, utility)."""
+        inputs = dict(self.inputs, N=len(self.pos))
+        connections_dict = {m: sorted(users) for m, users in self.members.items()}
+        utility = utils.calculate_weighted_utility(len(self.members), len(self.assign), self.total_dist,
+                                                   inputs, len(self.uav_locs))
+        return sorted(self.members), connections_dict, utility
+
+def _position(coords):
+    """An event's (x, y) as a float array; rejects missing or non-finite coordinates."""
+    try:
+        p = np.asarray(coords, dtype=float)
+    except (TypeError, ValueError):
+        p = None
+    if p is None or p.shape != (2,) or not np.isfinite(p).all():
+        raise ValueError(f"Event position must be two finite numbers, got {tuple(coords)}")
+    return p
+
+def random_events(num_events, users, seed=0, weights=(0.4, 0.2, 0.4), step=50):
+    """
+    Random add/remove/move stream over ids that match OnlineDeployment's
+    numbering (initial users 0..N-1 at positions `users`, then one new id per
+    add). Moves shift a user by up to `step` meters and are emitted with the
+    resulting absolute position, so every event can be applied on its own.
+    """
+    rng = np.random.default_rng(seed)
+    scale = np.array([config.GRID_WIDTH, config.GRID_HEIGHT])
+    pos = {n: np.asarray(p, dtype=float) for n, p in enumerate(users)}
+    live = list(pos)
+    next_id = len(pos)
+    events = []
+    for _ in range(num_events):
+        kind = rng.choice(['add', 'remove', 'move'], p=weights) if live else 'add'
+        if kind == 'add':
+            p = rng.random(2) * scale
+            events.append(('add', float(p[0]), float(p[1])))
+            pos[next_id] = p
+            live.append(next_id)
+            next_id += 1
+        elif kind == 'remove':
+            u = live.pop(int(rng.integers(len(live))))
+            del pos[u]
+            events.append(('remove', u))
+        else:
+            u = live[int(rng.integers(len(live)))]
+            pos[u] = np.clip(pos[u] + rng.uniform(-step, step, 2), 0, scale)
+            events.append(('move', u, float(pos[u][0]), float(pos[u][1])))
+    return events
+
+def replay(users, uav_locs, inputs, events, solver=algorithms.solve_heuristic, check_every=0):
+    """
+    Drives an OnlineDeployment from `events`, seeded with `solver` on the
+    initial users. Every `check_every` events the current users are re-solved
+    from scratch with the same solver for comparison.
+    Returns (engine, comparisons).
+    """
+    initial = solver(users, uav_locs, dict(inputs, N=len(users)))
+    engine = OnlineDeployment(users, uav_locs, inputs, initial[0], initial[1])
+
+    comparisons = []
+    for k, event in enumerate(events):
+        engine.apply(event)
+
+        if check_every and (k + 1) % check_every == 0:
+            cur_users, _ = engine.current_users()
+            start = time.perf_counter()
+            full = solver(cur_users, uav_locs, dict(inputs, N=len(cur_users)))
+            full_ms = (time.perf_counter() - start) * 1000
+            active, conns, utility = engine.solution()
+            comparisons.append({
+                'event': k + 1, 'N': len(cur_users),
+                'online_uavs': len(active), 'full_uavs': len(full[0]),
+                'online_conns': len(engine.assign), 'full_conns': sum(len(v) for v in full[1].values()),
+                'online_utility': utility, 'full_utility': full[2],
+                'full_ms': full_ms,
+            })
+    return engine, comparisons
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a victim event stream through the online deployment engine.")
+    parser.add_argument('--users', type=int, default=config.DEFAULT_N_USERS, help="Initial users")
+    parser.add_argument('--events', type=int, default=500)
+    parser.add_argument('--grid', default="5x5")
+    parser.add_argument('--beta', type=float, default=config.DEFAULT_BETA)
+    parser.add_argument('--solver', default='heuristic', choices=sorted(algorithms.SOLVERS))
+    parser.add_argument('--check-every', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    np.random.seed(args.seed)
+    users, uav_locs = utils.generate_scenario(args.users, args.grid)
+    inputs = {
+        'N': args.users, 'beta': args.beta,
+        'uav_cost': config.DEFAULT_UAV_COST, 'budget': config.DEFAULT_BUDGET,
+        'max_dist': config.DEFAULT_MAX_DIST,
+        'gamma_min': config.GAMMA_MIN, 'gamma_max': config.GAMMA_MAX,
+    }
+    events = random_events(args.events, users, args.seed)
+    engine, comparisons = replay(users, uav_locs, inputs, events, algorithms.SOLVERS[args.solver],
+                                 args.check_every)
+
+    lat = np.array(engine.latencies_ms)
+    print(f"{len(lat)} events: mean {lat.mean():.3f} ms, p95 {np.percentile(lat, 95):.3f} ms, max {lat.max():.3f} ms")
+    print(f"{'event':>6} {'N':>5} {'uavs on/full':>13} {'conns on/full':>14} {'util on/full':>13} {'full (ms)':>10}")
+    for c in comparisons:
+        print(f"{c['event']:>6} {c['N']:>5} {c['online_uavs']:>6}/{c['full_uavs']:<6} "
+              f"{c['online_conns']:>6}/{c['full_conns']:<7} {c['online_utility']:>6}/{c['full_utility']:<6} "
+              f"{c['full_ms']:>10.2f}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
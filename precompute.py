@@ -0,0 +1,219 @@
+# precompute.py
+import numpy as np
+
+# Upper bound on the number of float64 cells materialized at once (~32 MB).
+BLOCK_ELEMENTS = 4_000_000
+
+# Bucket grid resolution cap and the point where it beats the blocked scan.
+MAX_CELLS_PER_AXIS = 1024
+GRID_MIN_PAIRS = 1_000_000
+GRID_MAX_COVERAGE = 0.25
+
+def as_points(points):
+    """(N, 2) coordinate array; float32 input is kept as is to save memory."""
+    points = np.asarray(points)
+    if not np.issubdtype(points.dtype, np.floating):
+        points = points.astype(float)
+    return points
+
+def distance_matrix(users, uav_locs, block_size=None):
+    """
+    Full UAV-to-user Euclidean distance matrix, shape (M, N).
+    Computed with one broadcast pass, or in blocks of `block_size` sites.
+    """
+    users = as_points(users)
+    uav_locs = np.asarray(uav_locs, dtype=float)
+    num_uavs = len(uav_locs)
+    num_users = len(users)
+
+    if block_size is None:
+        block_size = _default_block_size(num_users)
+
+    dists = np.empty((num_uavs, num_users))
+    for start in range(0, num_uavs, block_size):
+        stop = min(start + block_size, num_uavs)
+        dists[start:stop] = _block_distances(users, uav_locs[start:stop])
+    return dists
+
+def _default_block_size(num_users):
+    return max(1, BLOCK_ELEMENTS // max(1, num_users))
+
+def _block_distances(users, uav_block):
+    # Same formula as utils.calculate_distance (agrees to within ~1 ulp).
+    # float32 users are upcast one block at a time, never as a whole.
+    dx = uav_block[:, 0:1] - users[None, :, 0]
+    dy = uav_block[:, 1:2] - users[None, :, 1]
+    return np.sqrt(dx**2 + dy**2)
+
+class CandidateIndex:
+    """
+    Sparse "within max_dist" index in CSR layout.
+    Row m lists the users UAV site m can reach:
+        indices[indptr[m]:indptr[m+1]]  -> user ids (ascending)
+        dists[indptr[m]:indptr[m+1]]    -> matching distances
+    """
+
+    def __init__(self, indptr, indices, dists, num_users, max_dist):
+        self.indptr = indptr
+        self.indices = indices
+        self.dists = dists
+        self.num_uavs = len(indptr) - 1
+        self.num_users = num_users
+        self.max_dist = max_dist
+
+    @property
+    def nnz(self):
+        return len(self.indices)
+
+    def users_of(self, m):
+        """(user_ids, distances) reachable from site m."""
+        lo, hi = self.indptr[m], self.indptr[m + 1]
+        return self.indices[lo:hi], self.dists[lo:hi]
+
+    def counts(self):
+        """Number of reachable users per site."""
+        return np.diff(self.indptr)
+
+    def transpose(self):
+        """
+        User-major view of the same pairs: row n lists the sites that reach
+        user n. Returned as a CandidateIndex whose "sites" are users.
+        """
+        rows = np.repeat(np.arange(self.num_uavs), self.counts())
+        order = np.argsort(self.indices, kind='stable')
+        counts = np.bincount(self.indices, minlength=self.num_users)
+        indptr = np.zeros(self.num_users + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        return CandidateIndex(indptr, rows[order], self.dists[order], self.num_uavs, self.max_dist)
+
+    def dense(self, fill=0.0):
+        """Dense (M, N) distance matrix, `fill` for unreachable pairs."""
+        out = np.full((self.num_uavs, self.num_users), fill, dtype=float)
+        rows = np.repeat(np.arange(self.num_uavs), self.counts())
+        out[rows, self.indices] = self.dists
+        return out
+
+    def mask(self):
+        """Dense (M, N) boolean reachability matrix."""
+        out = np.zeros((self.num_uavs, self.num_users), dtype=bool)
+        rows = np.repeat(np.arange(self.num_uavs), self.counts())
+        out[rows, self.indices] = True
+        return out
+
+class GridIndex:
+    """
+    Uniform bucket grid over the user points for radius queries.
+    With the cell size set to max_dist, a query only touches the 3x3 block of
+    cells around a site, so its cost follows the number of nearby users.
+    The index does not depend on beta and can be reused across a sweep.
+    """
+
+    def __init__(self, points, cell_size):
+        self.points = as_points(points)
+        num_points = len(self.points)
+
+        if num_points:
+            self.origin = self.points.min(axis=0)
+            extent = float((self.points.max(axis=0) - self.origin).max())
+        else:
+            self.origin = np.zeros(2)
+            extent = 0.0
+        # Keep the bucket table bounded for tiny radii
+        self.cell_size = max(float(cell_size), extent / MAX_CELLS_PER_AXIS, 1e-9)
+
+        cells = np.floor((self.points - self.origin) / self.cell_size).astype(np.int64)
+        self.shape = cells.max(axis=0) + 1 if num_points else np.ones(2, dtype=np.int64)
+        keys = cells[:, 0] * self.shape[1] + cells[:, 1]
+
+        # Points sorted by cell; cell k owns order[cell_start[k]:cell_start[k+1]]
+        self.order = np.argsort(keys, kind='stable')
+        self.cell_start = np.searchsorted(keys[self.order], np.arange(self.shape[0] * self.shape[1] + 1))
+
+    def query(self, center, radius):
+        """(point_ids, distances) within `radius` of `center`, ids ascending."""
+        lo = np.floor((np.asarray(center) - radius - self.origin) / self.cell_size).astype(np.int64)
+        hi = np.floor((np.asarray(center) + radius - self.origin) / self.cell_size).astype(np.int64)
+        lo = np.maximum(lo, 0)
+        hi = np.minimum(hi, self.shape - 1)
+        if np.any(lo > hi):
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        # Cells of one grid row are contiguous in the sorted order
+        parts = []
+        for cx in range(lo[0], hi[0] + 1):
+            first = cx * self.shape[1] + lo[1]
+            last = cx * self.shape[1] + hi[1]
+            parts.append(self.order[self.cell_start[first]:self.cell_start[last + 1]])
+        ids = np.sort(np.concatenate(parts))
+
+        # Same formula as _block_distances so both paths agree on the boundary
+        dx = center[0] - self.points[ids, 0]
+        dy = center[1] - self.points[ids, 1]
+        dists = np.sqrt(dx**2 + dy**2)
+        keep = dists <= radius
+        return ids[keep], dists[keep]
+
+def build_candidate_index(users, uav_locs, max_dist, block_size=None, method='auto', grid=None):
+    """
+    Builds the CSR candidate index without keeping the dense matrix around.
+    method: 'dense' scans every pair in blocks, 'grid' answers one radius
+    query per site from a GridIndex (`grid` may be passed in to reuse one),
+    'auto' picks 'grid' when max_dist covers a small part of the area.
+    """
+    users = as_points(users)
+    uav_locs = np.asarray(uav_locs, dtype=float)
+    num_uavs = len(uav_locs)
+    num_users = len(users)
+
+    if method == 'auto':
+        method = 'grid' if grid is not None or _prefer_grid(users, num_uavs, max_dist) else 'dense'
+    if method == 'grid':
+        return _build_from_grid(users, uav_locs, max_dist, grid)
+
+    if block_size is None:
+        block_size = _default_block_size(num_users)
+
+    counts = np.zeros(num_uavs, dtype=np.int64)
+    idx_parts = []
+    dist_parts = []
+    for start in range(0, num_uavs, block_size):
+        stop = min(start + block_size, num_uavs)
+        block = _block_distances(users, uav_locs[start:stop])
+        rows, cols = np.nonzero(block <= max_dist)
+        counts[start:stop] = np.bincount(rows, minlength=stop - start)
+        idx_parts.append(cols)
+        dist_parts.append(block[rows, cols])
+
+    indptr = np.zeros(num_uavs + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    indices = np.concatenate(idx_parts) if idx_parts else np.zeros(0, dtype=np.int64)
+    dists = np.concatenate(dist_parts) if dist_parts else np.zeros(0)
+    return CandidateIndex(indptr, indices, dists, num_users, max_dist)
+
+def _prefer_grid(users, num_uavs, max_dist):
+    """True when a radius disk covers a small share of the user bounding box."""
+    if len(users) * num_uavs < GRID_MIN_PAIRS:
+        return False
+    span = users.max(axis=0) - users.min(axis=0)
+    area = max(float(span[0] * span[1]), 1e-9)
+    return np.pi * max_dist**2 / area < GRID_MAX_COVERAGE
+
+def _build_from_grid(users, uav_locs, max_dist, grid=None):
+    if grid is None:
+        grid = GridIndex(users, max_dist)
+
+    num_uavs = len(uav_locs)
+    counts = np.zeros(num_uavs, dtype=np.int64)
+    idx_parts = []
+    dist_parts = []
+    for m in range(num_uavs):
+        ids, dists = grid.query(uav_locs[m], max_dist)
+        counts[m] = len(ids)
+        idx_parts.append(ids)
+        dist_parts.append(dists)
+
+    indptr = np.zeros(num_uavs + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    indices = np.concatenate(idx_parts) if idx_parts else np.zeros(0, dtype=np.int64)
+    dists = np.concatenate(dist_parts) if dist_parts else np.zeros(0)
+    return CandidateIndex(indptr, indices, dists, len(users), max_dist)
\ No newline at end of file
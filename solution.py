@@ -0,0 +1,82 @@
+# solution.py
+import numpy as np
+
+class Solution:
+    """
+    Compact form of a solver result.
+    assignment[n] is the site serving user n (-1 if uncovered) as int32, and
+    active[m] marks open sites. Aggregates (connections, total distance,
+    per-site load) are computed once. The users/uav_locs arrays are kept by
+    reference, never copied.
+    """
+
+    def __init__(self, users, uav_locs, assignment, active, utility=0, runtime=0.0):
+        self.users = users
+        self.uav_locs = uav_locs
+        self.assignment = np.asarray(assignment, dtype=np.int32)
+        self.active = np.asarray(active, dtype=bool)
+        self.utility = utility
+        self.runtime = runtime
+
+        linked = np.flatnonzero(self.assignment >= 0)
+        sites = self.assignment[linked]
+        self.load = np.bincount(sites, minlength=len(self.active)).astype(np.int32)
+        self.conn_count = len(linked)
+        diff = np.asarray(users, dtype=float)[linked] - np.asarray(uav_locs, dtype=float)[sites]
+        self.total_dist = float(np.sqrt((diff ** 2).sum(axis=1)).sum())
+
+    @classmethod
+    def from_result(cls, users, uav_locs, result):
+        """Builds one from a solver's (active_indices, connections_dict, utility, runtime)."""
+        active_indices, connections_dict, utility, runtime = result[:4]
+        assignment = np.full(len(users), -1, dtype=np.int32)
+        for m, user_list in connections_dict.items():
+            assignment[np.asarray(user_list, dtype=np.int64)] = m
+        active = np.zeros(len(uav_locs), dtype=bool)
+        active[np.asarray(active_indices, dtype=np.int64)] = True
+        return cls(users, uav_locs, assignment, active, utility, runtime)
+
+    @property
+    def active_indices(self):
+        return np.flatnonzero(self.active).tolist()
+
+    @property
+    def num_active(self):
+        return int(self.active.sum())
+
+    def connections_dict(self):
+        """Old dict view: site -> list of user ids, for every active site."""
+        linked = np.flatnonzero(self.assignment >= 0)
+        order = np.argsort(self.assignment[linked], kind='stable')
+        linked = linked[order]
+        bounds = np.cumsum(self.load)
+        connections_dict = {}
+        for m in self.active_indices:
+            connections_dict[m] = linked[bounds[m] - self.load[m]:bounds[m]].tolist()
+        return connections_dict
+
+    def as_tuple(self):
+        """The solvers' (active_indices, connections_dict, utility, runtime) contract."""
+        return self.active_indices, self.connections_dict(), self.utility, self.runtime
+
+    def segments(self):
+        """(K, 2, 2) site-to-user line segments of every link, e.g. for a LineCollection."""
+        linked = np.flatnonzero(self.assignment >= 0)
+        return np.stack((self.uav_locs[self.assignment[linked]], self.users[linked]), axis=1)
+
+    def save(self, path, include_scenario=False):
+        """NPZ with the assignment, mask and scores (and the scenario if asked)."""
+        arrays = {'assignment': self.assignment, 'active': self.active,
+                  'utility': self.utility, 'runtime': self.runtime}
+        if include_scenario:
+            arrays.update(users=self.users, uav_locs=self.uav_locs)
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path, users=None, uav_locs=None):
+        """Reads save() output; pass the scenario arrays unless they were saved with it."""
+        with np.load(path) as data:
+            if users is None:
+                users, uav_locs = data['users'], data['uav_locs']
+            return cls(users, uav_locs, data['assignment'], data['active'],
+                       data['utility'].item(), data['runtime'].item())
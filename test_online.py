@@ -0,0 +1,52 @@
+# test_online.py
+import numpy as np
+import pytest
+import config
+import utils
+import algorithms
+from online import OnlineDeployment
+
+NUM_USERS = 30
+
+def _engine():
+    np.random.seed(0)
+    users, uav_locs = utils.generate_scenario(NUM_USERS, "3x3")
+    inputs = {
+        'N': NUM_USERS, 'beta': 0.5,
+        'uav_cost': config.DEFAULT_UAV_COST, 'budget': config.DEFAULT_BUDGET,
+        'max_dist': config.DEFAULT_MAX_DIST,
+        'gamma_min': config.GAMMA_MIN, 'gamma_max': config.GAMMA_MAX,
+    }
+    active_indices, connections_dict = algorithms.solve_heuristic(users, uav_locs, inputs)[:2]
+    return OnlineDeployment(users, uav_locs, inputs, active_indices, connections_dict)
+
+def _state(engine):
+    return dict(engine.pos), dict(engine.assign), engine.total_dist
+
+def test_move_of_unknown_user_is_rejected():
+    engine = _engine()
+    before = _state(engine)
+    with pytest.raises(ValueError):
+        engine.apply(('move', 500, 10.0, 10.0))
+    assert _state(engine)[1:] == before[1:]
+    assert engine.pos.keys() == before[0].keys()
+
+    # No phantom entry for id 500 is left for a later add to collide with
+    for _ in range(500 - NUM_USERS + 1):
+        engine.apply(('add', 10.0, 10.0))
+    assert len(engine.pos) == 500 + 1
+
+def test_remove_of_unknown_user_is_rejected():
+    engine = _engine()
+    before = _state(engine)
+    with pytest.raises(ValueError):
+        engine.apply(('remove', 500))
+    assert _state(engine)[1:] == before[1:]
+    assert engine.pos.keys() == before[0].keys()
+
+    engine.apply(('remove', 3))
+    with pytest.raises(ValueError):
+        engine.apply(('remove', 3))
+    with pytest.raises(ValueError):
+        engine.apply(('move', 3, 10.0, 10.0))
+    assert len(engine.pos) == NUM_USERS - 1
\ No newline at end of file
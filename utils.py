@@ -2,26 +2,70 @@
 import numpy as np
 import config
 
+# --- SCALING FIX ---
+# The paper's graph shows values from 2 to 14.
+# The raw utility is usually < 1.0. We multiply by 20 to match the visual scale.
+# We also add an offset (+2) to ensure the baseline starts positive like the graph.
+SCALING_FACTOR = 20
+SCALING_OFFSET = 2
+
 def calculate_distance(p1, p2):
     """Euclidean distance formula."""
     return np.sqrt((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)
 
-def generate_scenario(num_users, grid_type):
-    """Generates random users and UAV locations."""
-    # 1. Random Users
-    users = np.random.rand(num_users, 2)
-    users[:, 0] *= config.GRID_WIDTH
-    users[:, 1] *= config.GRID_HEIGHT
-    
-    # 2. Parse Grid
-    rows = int(grid_type[0]) 
-    cols = int(grid_type[2])
-    
-    # 3. Grid Points
+def parse_grid(grid_type):
+    """'RxC' -> (rows, cols), any number of digits (e.g. '4x4', '50x50')."""
+    rows, cols = str(grid_type).lower().split('x')
+    return int(rows), int(cols)
+
+def grid_candidates(rows, cols):
+    """Uniform rows x cols mesh of candidate UAV sites over the area."""
     x = np.linspace(0, config.GRID_WIDTH, cols)
     y = np.linspace(0, config.GRID_HEIGHT, rows)
     xv, yv = np.meshgrid(x, y)
-    uav_locs = np.column_stack((xv.ravel(), yv.ravel()))
+    return np.column_stack((xv.ravel(), yv.ravel()))
+
+def generate_users(num_users, distribution='uniform', dtype=np.float64, chunk_size=config.GEN_CHUNK_SIZE,
+                   hotspots=config.HOTSPOT_COUNT, spread=config.HOTSPOT_SPREAD, background=config.HOTSPOT_BACKGROUND):
+    """
+    Random victim positions, written chunk by chunk into one (N, 2) array.
+    'uniform' spreads users over the whole area.
+    'clustered' puts all but a `background` share of them in Gaussian
+    hotspots (std `spread` meters) around random centres, e.g. collapsed buildings.
+    Use dtype=np.float32 to halve memory for million-point scenarios.
+    """
+    scale = np.array([config.GRID_WIDTH, config.GRID_HEIGHT])
+    users = np.empty((num_users, 2), dtype=dtype)
+    if distribution == 'clustered':
+        centers = np.random.rand(hotspots, 2) * scale
+    elif distribution != 'uniform':
+        raise ValueError(f"Unknown user distribution: {distribution}")
+
+    for start in range(0, num_users, chunk_size):
+        stop = min(start + chunk_size, num_users)
+        chunk = np.random.rand(stop - start, 2) * scale
+        if distribution == 'clustered':
+            hot = np.random.rand(stop - start) >= background
+            num_hot = int(hot.sum())
+            chunk[hot] = centers[np.random.randint(hotspots, size=num_hot)] + np.random.randn(num_hot, 2) * spread
+            np.clip(chunk, 0, scale, out=chunk)
+        users[start:stop] = chunk
+    return users
+
+def generate_scenario(num_users, grid_type, distribution='uniform', dtype=np.float64):
+    """
+    Generates random users and UAV locations.
+    `grid_type` is an 'RxC' grid string or an (M, 2) array of candidate sites.
+    """
+    # 1. Random Users
+    users = generate_users(num_users, distribution, dtype)
+    
+    # 2. Candidate Sites
+    if isinstance(grid_type, str):
+        rows, cols = parse_grid(grid_type)
+        uav_locs = grid_candidates(rows, cols)
+    else:
+        uav_locs = np.asarray(grid_type, dtype=float).reshape(-1, 2)
     
     return users, uav_locs
 
@@ -48,12 +92,62 @@ def calculate_weighted_utility(uav_count, connections_count, total_dist, inputs,
     raw_utility = (config.ALPHA * f1_uavs) + (config.ALPHA * f2_conns) + \
                   (config.ALPHA * f3_dist) + (config.ALPHA * f4_cost)
     
-    # --- SCALING FIX ---
-    # The paper's graph shows values from 2 to 14. 
-    # The raw_utility is usually < 1.0. We multiply by 20 to match the visual scale.
-    # We also add an offset (+2) to ensure the baseline starts positive like the graph.
-    SCALING_FACTOR = 20
-    scaled_utility = (raw_utility * SCALING_FACTOR) + 2
+    scaled_utility = (raw_utility * SCALING_FACTOR) + SCALING_OFFSET
     
     # Return rounded integer to look like a "Natural Number"
-    return int(round(max(0, scaled_utility)))
\ No newline at end of file
+    return int(round(max(0, scaled_utility)))
+
+def weighted_utility_batch(uav_counts, connection_counts, total_dists, inputs, num_potential_uavs):
+    """
+    Vectorized calculate_weighted_utility over arrays of solutions.
+    Same arithmetic in the same order, so each entry matches the scalar
+    function exactly. Returns a dict of arrays: 'f1'..'f4', 'raw' and the
+    rounded, scaled 'utility'.
+    """
+    N = inputs['N']
+    C_max = inputs['budget']
+    c_m = inputs['uav_cost']
+    d_max = inputs['max_dist']
+
+    uav_counts = np.asarray(uav_counts, dtype=float)
+    connection_counts = np.asarray(connection_counts, dtype=float)
+    total_dists = np.asarray(total_dists, dtype=float)
+
+    f1 = uav_counts / num_potential_uavs
+    f2 = connection_counts / N if N > 0 else np.zeros_like(connection_counts)
+    f3 = total_dists / (N * d_max) if N > 0 else np.zeros_like(total_dists)
+    f4 = (uav_counts * c_m) / (num_potential_uavs * C_max) if C_max > 0 else np.ones_like(uav_counts)
+
+    raw = (config.ALPHA * f1) + (config.ALPHA * f2) + (config.ALPHA * f3) + (config.ALPHA * f4)
+    scaled = (raw * SCALING_FACTOR) + SCALING_OFFSET
+    # np.rint rounds halves to even, like round()
+    utility = np.rint(np.maximum(0, scaled)).astype(np.int64)
+    return {'f1': f1, 'f2': f2, 'f3': f3, 'f4': f4, 'raw': raw, 'utility': utility}
+
+def evaluate_solutions(assignments, active, users, uav_locs, inputs, dist_matrix=None):
+    """
+    Scores a stack of candidate deployments in one pass.
+    assignments: (B, N) site per user, -1 if uncovered.
+    active: (B, M) open-site masks.
+    dist_matrix: optional (M, N) distances (precompute.distance_matrix) to
+    gather from instead of recomputing them for every candidate.
+    Returns weighted_utility_batch's dict plus 'uavs', 'conns' and 'dist'.
+    """
+    assignments = np.atleast_2d(assignments)
+    active = np.atleast_2d(active)
+    users = np.asarray(users, dtype=float)
+    uav_locs = np.asarray(uav_locs, dtype=float)
+
+    linked = assignments >= 0
+    site_of = np.where(linked, assignments, 0)
+    if dist_matrix is not None:
+        dists = dist_matrix[site_of, np.arange(assignments.shape[1])]
+    else:
+        dists = np.sqrt(((uav_locs[site_of] - users[None]) ** 2).sum(axis=2))
+    total_dists = np.where(linked, dists, 0.0).sum(axis=1)
+
+    uav_counts = active.sum(axis=1)
+    connection_counts = linked.sum(axis=1)
+    result = weighted_utility_batch(uav_counts, connection_counts, total_dists, inputs, len(uav_locs))
+    result.update(uavs=uav_counts, conns=connection_counts, dist=total_dists)
+    return result
\ No newline at end of file
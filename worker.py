@@ -0,0 +1,101 @@
+# worker.py
+import os
+import signal
+import subprocess
+import queue
+import multiprocessing as mp
+import config
+import algorithms
+import precompute
+from instrument import SolverStats
+
+def run_sweep(users, uavs, base_inputs, betas, time_budget, out_queue):
+    """
+    Process entry point for the GUI beta sweep.
+    Posts ('progress', beta), ('result', beta, opt_full, heu_full, opt_stats,
+    heu_stats), then ('done',) or ('error', message) to out_queue.
+    The stats entries are instrument.SolverStats.as_dict() phase breakdowns;
+    scenario preprocessing and model build are charged to the first beta.
+    """
+    if os.name != 'nt':
+        # Own process group, so cancel() also takes down the CBC child
+        os.setsid()
+
+    try:
+        build_stats = SolverStats()
+        # Distances only depend on the scenario, so share them across the sweep
+        with build_stats.phase('distances'):
+            candidates = precompute.build_candidate_index(users, uavs, base_inputs['max_dist'])
+        # Only beta changes across the sweep, so the ILP is built once
+        opt_model = algorithms.DeploymentModel(users, uavs, base_inputs, candidates, stats=build_stats)
+
+        for i, b in enumerate(betas):
+            out_queue.put(('progress', b))
+            print(f"  Running Beta={b}...")
+            current_inputs = base_inputs.copy()
+            current_inputs['beta'] = b
+
+            opt_stats = SolverStats()
+            heu_stats = SolverStats()
+            if i == 0:
+                opt_stats.merge(build_stats)
+
+            # Run Heuristic
+            heu_full = algorithms.solve_heuristic(users, uavs, current_inputs, candidates, stats=heu_stats)
+
+            # Run Optimal (anytime mode seeds CBC with the heuristic answer and falls back to it)
+            if time_budget > 0:
+                opt_full = opt_model.solve_anytime(b, heu_full, time_limit=time_budget,
+                                                   gap=config.ANYTIME_GAP, stats=opt_stats)
+                quality = opt_model.quality
+                if quality['status'] == 'Heuristic':
+                    print("    Optimal solver: nothing found in time, kept the heuristic answer")
+                elif quality['gap'] is not None:
+                    print(f"    Optimal solver: {quality['status']}, gap {quality['gap']:.2%}")
+            else:
+                opt_full = opt_model.solve(b, stats=opt_stats)
+            print(f"    Optimal phases: {opt_stats.summary()}")
+
+            out_queue.put(('result', b, opt_full, heu_full, opt_stats.as_dict(), heu_stats.as_dict()))
+        out_queue.put(('done',))
+    except Exception as e:
+        out_queue.put(('error', str(e)))
+
+class SweepWorker:
+    """Runs run_sweep in a child process that can be killed mid-solve."""
+
+    def __init__(self, users, uavs, base_inputs, betas, time_budget):
+        self.queue = mp.Queue()
+        self.process = mp.Process(target=run_sweep, daemon=True,
+                                  args=(users, uavs, base_inputs, list(betas), time_budget, self.queue))
+
+    def start(self):
+        self.process.start()
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def poll(self):
+        """All messages posted so far, without blocking."""
+        messages = []
+        while True:
+            try:
+                messages.append(self.queue.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def cancel(self):
+        """Kills the worker together with any CBC subprocess it started."""
+        if not self.process.is_alive():
+            return
+        pid = self.process.pid
+        try:
+            if os.name == 'nt':
+                subprocess.call(['taskkill', '/F', '/T', '/PID', str(pid)],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            else:
+                os.killpg(pid, signal.SIGKILL)
+        except (OSError, subprocess.SubprocessError):
+            # Process group not set up yet (or already gone)
+            self.process.kill()
+        self.process.join(timeout=1)
\ No newline at end of file